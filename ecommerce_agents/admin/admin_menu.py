@@ -1,4 +1,5 @@
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Union
+import asyncio
 from .api import AdminAPI, UpdateSettingsRequest
 
 class AdminMenu:
@@ -6,6 +7,18 @@ class AdminMenu:
         """Initialize the admin menu with storage backend."""
         self.api = AdminAPI(db_file=db_file)
         self._current_user_id: Optional[str] = None
+        # Menu handlers in option order, so option "1" maps to index 0
+        self._handlers = (
+            self._update_personal_info,
+            self._update_business_info,
+            self._update_target_countries,
+            self._update_competitors,
+            self._update_main_urls,
+            self._display_settings,
+            self._save_settings,
+            self._reset_settings,
+            self._exit_menu
+        )
 
     @property
     def current_user_id(self) -> str:
@@ -24,12 +37,12 @@ class AdminMenu:
     async def get_settings(self) -> Dict[str, Any]:
         """Get settings for current user."""
         settings = await self.api.get_settings(self.current_user_id)
-        return settings.dict()
+        return settings.model_dump()
 
-    async def update_settings(self, updates: Dict[str, Any]) -> Dict[str, Any]:
+    async def update_settings(self, updates: Union[Dict[str, Any], UpdateSettingsRequest]) -> Dict[str, Any]:
         """Update settings for current user."""
         settings = await self.api.update_settings(self.current_user_id, updates)
-        return settings.dict()
+        return settings.model_dump()
 
     async def display_menu(self) -> str:
         menu = """
@@ -48,81 +61,77 @@ Choose an option (1-9): """
         return menu
 
     async def handle_input(self, choice: str) -> tuple[bool, str]:
-        handlers = {
-            "1": self._update_personal_info,
-            "2": self._update_business_info,
-            "3": self._update_target_countries,
-            "4": self._update_competitors,
-            "5": self._update_main_urls,
-            "6": self._display_settings,
-            "7": self._save_settings,
-            "8": self._reset_settings,
-            "9": self._exit_menu
-        }
-        
-        handler = handlers.get(choice)
-        if handler:
-            return await handler()
+        if len(choice) == 1:
+            index = ord(choice) - ord("1")
+            if 0 <= index < len(self._handlers):
+                return await self._handlers[index]()
         return True, "Invalid option. Please try again."
 
+    async def _read_line(self, prompt: str = "") -> str:
+        """Read a line of user input without blocking the event loop."""
+        line = await asyncio.to_thread(input, prompt)
+        return line.strip()
+
     async def _update_personal_info(self) -> tuple[bool, str]:
-        name = input("Enter your name (or press Enter to skip): ").strip()
-        first_name = input("Enter your first name (or press Enter to skip): ").strip()
-        
+        name = await self._read_line("Enter your name (or press Enter to skip): ")
+        first_name = await self._read_line("Enter your first name (or press Enter to skip): ")
+        if not name and not first_name:
+            return True, "Personal info unchanged."
+
         updates = UpdateSettingsRequest(
             name=name if name else None,
             first_name=first_name if first_name else None
         )
-        await self.update_settings(updates.dict())
+        await self.update_settings(updates)
         return True, "Personal info updated."
 
     async def _update_business_info(self) -> tuple[bool, str]:
-        business_name = input("Enter your business name: ").strip()
+        business_name = await self._read_line("Enter your business name: ")
         if business_name:
             updates = UpdateSettingsRequest(business_name=business_name)
-            await self.update_settings(updates.dict())
+            await self.update_settings(updates)
         return True, "Business info updated."
 
     async def _update_target_countries(self) -> tuple[bool, str]:
         print("Enter target countries (one per line, empty line to finish):")
         countries = []
         while True:
-            country = input().strip()
+            country = await self._read_line()
             if not country:
                 break
             countries.append(country)
         
         if countries:
             updates = UpdateSettingsRequest(target_countries=countries)
-            await self.update_settings(updates.dict())
+            await self.update_settings(updates)
         return True, f"{len(countries)} target countries updated."
 
     async def _update_competitors(self) -> tuple[bool, str]:
         print("Enter competitors (one per line, empty line to finish):")
         competitors = []
         while True:
-            competitor = input().strip()
+            competitor = await self._read_line()
             if not competitor:
                 break
             competitors.append(competitor)
         
         if competitors:
             updates = UpdateSettingsRequest(competitors=competitors)
-            await self.update_settings(updates.dict())
+            await self.update_settings(updates)
         return True, f"{len(competitors)} competitors updated."
 
     async def _update_main_urls(self) -> tuple[bool, str]:
         print("Enter main URLs (one per line, empty line to finish):")
         urls = []
         while True:
-            url = input().strip()
+            url = await self._read_line()
             if not url:
                 break
             urls.append(url)
         
         if urls:
             updates = UpdateSettingsRequest(main_urls=urls)
-            await self.update_settings(updates.dict())
+            await self.update_settings(updates)
         return True, f"{len(urls)} URLs updated."
 
     async def _display_settings(self) -> tuple[bool, str]:
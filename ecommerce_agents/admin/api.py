@@ -1,5 +1,6 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Union
 from .settings import AdminSettings, AdminStorage
+from .batcher import SettingsBatcher
 from pydantic import BaseModel
 
 class UpdateSettingsRequest(BaseModel):
@@ -17,6 +18,7 @@ class AdminAPI:
     def __init__(self, db_file: str = "tmp/admin.db"):
         """Initialize the Admin API with storage backend."""
         self.storage = AdminStorage(db_file=db_file)
+        self._batcher = SettingsBatcher(self.storage)
 
     async def create_user(self) -> str:
         """Create a new user and return their ID."""
@@ -29,15 +31,23 @@ class AdminAPI:
         """Get settings for a specific user."""
         return await self.storage.get_settings(user_id)
 
-    async def update_settings(self, user_id: str, updates: UpdateSettingsRequest) -> AdminSettings:
-        """Update settings for a specific user."""
-        settings = await self.storage.get_settings(user_id)
-        update_dict = updates.dict(exclude_unset=True)
-        for key, value in update_dict.items():
-            if hasattr(settings, key):
-                setattr(settings, key, value)
-        await self.storage.save_settings(settings)
-        return settings
+    async def update_settings(
+        self,
+        user_id: str,
+        updates: Union[Dict[str, Any], UpdateSettingsRequest]
+    ) -> AdminSettings:
+        """Update settings for a specific user.
+
+        Accepts either a request model or a plain dict of the fields to change.
+        Concurrent updates are coalesced by the batcher into a single write.
+        """
+        if isinstance(updates, BaseModel):
+            update_dict = updates.model_dump(exclude_unset=True)
+        else:
+            update_dict = updates
+        if not update_dict:
+            return await self.storage.get_settings(user_id)
+        return await self._batcher.submit(user_id, update_dict)
 
     async def delete_user(self, user_id: str) -> None:
         """Delete a user's settings."""
@@ -0,0 +1,70 @@
+from typing import Dict, Any, List, Optional, Set, Tuple
+import asyncio
+from .settings import AdminSettings, AdminStorage
+
+class SettingsBatcher:
+    """Coalesces settings updates that arrive within a short window into a single write.
+
+    Updates are queued per call and drained by a background task, which folds them
+    into the latest AdminSettings for each user and persists all dirty users in one
+    transaction.
+    """
+    def __init__(self, storage: AdminStorage, max_batch: int = 32, max_wait_ms: int = 20):
+        """Initialize the batcher for the given storage backend."""
+        self.storage = storage
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    async def submit(self, user_id: str, updates: Dict[str, Any]) -> AdminSettings:
+        """Queue an update for a user and wait until it has been persisted."""
+        if self._worker is None or self._worker.done():
+            # Started lazily so the queue and task bind to the running event loop
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((user_id, updates, future))
+        return await future
+
+    async def _run(self) -> None:
+        """Drain the queue, collecting up to max_batch items or max_wait seconds per flush."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            await self._flush(batch)
+
+    async def _flush(self, batch: List[Tuple[str, Dict[str, Any], asyncio.Future]]) -> None:
+        """Apply a batch of updates and persist every dirty user in one transaction."""
+        dirty: Dict[str, AdminSettings] = {}
+        dirty_fields: Dict[str, Set[str]] = {}
+        try:
+            for user_id, updates, _ in batch:
+                settings = dirty.get(user_id)
+                if settings is None:
+                    settings = await self.storage.get_settings(user_id)
+                    dirty[user_id] = settings
+                    dirty_fields[user_id] = set()
+                for key, value in updates.items():
+                    if hasattr(settings, key):
+                        setattr(settings, key, value)
+                        dirty_fields[user_id].add(key)
+            await self.storage.save_many(list(dirty.values()), dirty_fields)
+        except Exception as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for user_id, _, future in batch:
+            if not future.done():
+                future.set_result(dirty[user_id])
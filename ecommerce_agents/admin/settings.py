@@ -1,9 +1,17 @@
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, List, Optional, Sequence, Set, Tuple
+from concurrent.futures import Future
+from functools import lru_cache
+from pathlib import Path
 from pydantic import BaseModel
+import asyncio
+import logging
+import queue
 import sqlite3
+import threading
+import time
 import os
 import uuid
-import json
+import orjson
 
 class AdminSettings(BaseModel):
     user_id: str
@@ -13,53 +21,251 @@ class AdminSettings(BaseModel):
     competitors: list = []
     main_urls: list = []
 
+# Each settings field is stored in its own JSON column so partial updates only
+# rewrite the fields that changed.
+SETTINGS_COLUMNS = (
+    "personal_info",
+    "business_details",
+    "target_countries",
+    "competitors",
+    "main_urls",
+)
+
+@lru_cache(maxsize=None)
+def _upsert_sql(columns: Tuple[str, ...]) -> str:
+    """Build an upsert that inserts the full row but only rewrites ``columns`` on conflict."""
+    return f"""
+        INSERT INTO admin_settings (user_id, {', '.join(SETTINGS_COLUMNS)})
+        VALUES (?{', ?' * len(SETTINGS_COLUMNS)})
+        ON CONFLICT(user_id) DO UPDATE SET {', '.join(f'{column} = excluded.{column}' for column in columns)}
+    """
+
+def _to_row(settings: AdminSettings) -> List[Any]:
+    """Serialize settings into the parameter list expected by ``_upsert_sql``."""
+    return [settings.user_id] + [orjson.dumps(getattr(settings, column)).decode() for column in SETTINGS_COLUMNS]
+
+# A write job is a list of (sql, rows) statements plus the future resolved once they commit
+WriteJob = Tuple[List[Tuple[str, List[Sequence[Any]]]], Future]
+
+logger = logging.getLogger(__name__)
+
+def _settle(future: Future, error: Optional[BaseException] = None) -> None:
+    """Resolve a job's future with its outcome, unless it is already done."""
+    if future.done():
+        return
+    if error is None:
+        future.set_result(None)
+    else:
+        future.set_exception(error)
+
 class AdminStorage:
-    def __init__(self, db_file: str = "tmp/admin.db"):
+    """SQLite-backed settings storage.
+
+    All writes go through a single writer thread that owns the read-write connection,
+    so concurrent callers never race for the write lock. Reads use a separate
+    read-only connection, which WAL mode lets proceed while a write is in flight.
+
+    Settings read or written through this instance are cached for ``cache_ttl``
+    seconds, so writes made through another instance (e.g. the admin UI's) are
+    picked up once the cached copy expires.
+    """
+    def __init__(self, db_file: str = "tmp/admin.db", cache_ttl: float = 300.0):
         """Initialize admin storage with SQLite backend."""
         os.makedirs(os.path.dirname(db_file), exist_ok=True)
         self.db_file = db_file
+        self.cache_ttl = cache_ttl
+        # Settings recently loaded or written by this instance, keyed by user_id,
+        # with the monotonic time at which each entry expires
+        self._cache: Dict[str, Tuple[float, AdminSettings]] = {}
+        self._write_conn = self._connect(self.db_file)
         self._init_db()
+        self._read_conn = self._connect(f"{Path(db_file).resolve().as_uri()}?mode=ro", uri=True)
+        self._write_queue: "queue.Queue[Optional[WriteJob]]" = queue.Queue()
+        self._writer = threading.Thread(target=self._writer_loop, name="admin-settings-writer", daemon=True)
+        self._writer.start()
 
     def _init_db(self):
         """Initialize the database with required tables."""
-        with sqlite3.connect(self.db_file) as conn:
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS admin_settings (
-                    user_id TEXT PRIMARY KEY,
-                    settings TEXT NOT NULL
-                )
-            """)
+        columns = [row[1] for row in self._write_conn.execute("PRAGMA table_info(admin_settings)")]
+        if "settings" in columns:
+            self._migrate_legacy_table()
+        self._create_table()
+        # journal_mode is persistent, so it only needs to be set once
+        self._write_conn.execute("PRAGMA journal_mode=WAL")
+
+    def _create_table(self):
+        """Create the settings table with one JSON column per settings field."""
+        column_defs = ",\n".join(f"{column} JSON" for column in SETTINGS_COLUMNS)
+        self._write_conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS admin_settings (
+                user_id TEXT PRIMARY KEY,
+                {column_defs}
+            )
+        """)
+
+    def _migrate_legacy_table(self):
+        """Move rows from the old single-blob schema into per-field columns.
+
+        Runs in one transaction, so a failure part way leaves the legacy table
+        untouched and the migration is retried on the next start.
+        """
+        self._write_conn.execute("BEGIN")
+        try:
+            self._write_conn.execute("ALTER TABLE admin_settings RENAME TO admin_settings_legacy")
+            self._create_table()
+            rows = self._write_conn.execute("SELECT user_id, settings FROM admin_settings_legacy").fetchall()
+            self._write_conn.executemany(
+                _upsert_sql(SETTINGS_COLUMNS),
+                [_to_row(AdminSettings(**{**orjson.loads(blob), "user_id": user_id})) for user_id, blob in rows]
+            )
+            self._write_conn.execute("DROP TABLE admin_settings_legacy")
+        except Exception:
+            self._write_conn.execute("ROLLBACK")
+            raise
+        self._write_conn.execute("COMMIT")
+
+    @staticmethod
+    def _connect(database: str, uri: bool = False) -> sqlite3.Connection:
+        """Open a connection with the per-connection pragmas applied."""
+        conn = sqlite3.connect(
+            database,
+            uri=uri,
+            check_same_thread=False,
+            isolation_level=None,
+            cached_statements=256
+        )
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA mmap_size=268435456")
+        conn.execute("PRAGMA cache_size=-64000")
+        conn.execute("PRAGMA busy_timeout=5000")
+        return conn
+
+    def _writer_loop(self) -> None:
+        """Apply queued write jobs, grouping everything queued so far into one transaction."""
+        while True:
+            jobs = [self._write_queue.get()]
+            while True:
+                try:
+                    jobs.append(self._write_queue.get_nowait())
+                except queue.Empty:
+                    break
+            # Jobs whose callers were cancelled are dropped; the rest are marked
+            # running, so they can no longer be cancelled under the writer
+            live_jobs = [job for job in jobs if job is not None and job[1].set_running_or_notify_cancel()]
+            try:
+                self._apply(live_jobs)
+            except Exception as e:
+                # Never let the writer thread die, or every later write would hang
+                logger.exception("Error applying admin settings writes")
+                for _, future in live_jobs:
+                    _settle(future, e)
+            if None in jobs:
+                return
+
+    def _apply(self, jobs: List[WriteJob]) -> None:
+        """Commit a group of jobs, falling back to one transaction per job on failure."""
+        if not jobs:
+            return
+        try:
+            self._write_conn.execute("BEGIN")
+            try:
+                for statements, _ in jobs:
+                    for sql, rows in statements:
+                        self._write_conn.executemany(sql, rows)
+            except Exception:
+                self._write_conn.execute("ROLLBACK")
+                raise
+            self._write_conn.execute("COMMIT")
+        except Exception as e:
+            if len(jobs) == 1:
+                _settle(jobs[0][1], e)
+                return
+            # Retry individually so one bad job does not fail the others in its group
+            for job in jobs:
+                self._apply([job])
+            return
+
+        for _, future in jobs:
+            _settle(future)
+
+    async def _submit(self, statements: List[Tuple[str, List[Sequence[Any]]]]) -> None:
+        """Queue statements for the writer thread and wait until they are committed."""
+        future: Future = Future()
+        self._write_queue.put((statements, future))
+        await asyncio.wrap_future(future)
 
     async def get_settings(self, user_id: str) -> AdminSettings:
         """Get settings for a specific user."""
-        with sqlite3.connect(self.db_file) as conn:
-            cursor = conn.execute(
-                "SELECT settings FROM admin_settings WHERE user_id = ?",
-                (user_id,)
-            )
-            row = cursor.fetchone()
-            if not row:
-                return AdminSettings(user_id=user_id)
-            return AdminSettings(**json.loads(row[0]))
-
-    async def save_settings(self, settings: AdminSettings) -> None:
-        """Save settings for a specific user."""
-        with sqlite3.connect(self.db_file) as conn:
-            conn.execute(
-                """
-                INSERT OR REPLACE INTO admin_settings (user_id, settings)
-                VALUES (?, ?)
-                """,
-                (settings.user_id, json.dumps(settings.dict()))
+        cached = self._cache.get(user_id)
+        if cached is not None and cached[0] > time.monotonic():
+            # Callers (e.g. the batcher) update the returned settings before they
+            # are committed, so never hand out the cached instance itself
+            return cached[1].model_copy(deep=True)
+        row = self._read_conn.execute(
+            f"SELECT {', '.join(SETTINGS_COLUMNS)} FROM admin_settings WHERE user_id = ?",
+            (user_id,)
+        ).fetchone()
+        if not row:
+            return AdminSettings(user_id=user_id)
+        values = {
+            column: orjson.loads(value)
+            for column, value in zip(SETTINGS_COLUMNS, row)
+            if value is not None
+        }
+        settings = AdminSettings(user_id=user_id, **values)
+        self._cache_settings(settings)
+        return settings
+
+    def _cache_settings(self, settings: AdminSettings) -> None:
+        """Cache a private copy of settings until ``cache_ttl`` seconds from now."""
+        self._cache[settings.user_id] = (time.monotonic() + self.cache_ttl, settings.model_copy(deep=True))
+
+    async def save_settings(self, settings: AdminSettings, fields: Optional[Iterable[str]] = None) -> None:
+        """Save settings for a specific user.
+
+        When ``fields`` is given, only those columns are rewritten for an existing row.
+        """
+        dirty_fields = None if fields is None else {settings.user_id: set(fields)}
+        await self.save_many([settings], dirty_fields)
+
+    async def save_many(
+        self,
+        settings_list: List[AdminSettings],
+        dirty_fields: Optional[Dict[str, Set[str]]] = None
+    ) -> None:
+        """Save settings for several users in a single transaction.
+
+        Rows sharing the same set of dirty columns are written with one executemany call.
+        """
+        dirty_fields = dirty_fields or {}
+        groups: Dict[Tuple[str, ...], List[AdminSettings]] = {}
+        for settings in settings_list:
+            fields = dirty_fields.get(settings.user_id)
+            columns = SETTINGS_COLUMNS if fields is None else tuple(
+                column for column in SETTINGS_COLUMNS if column in fields
             )
+            if columns:
+                groups.setdefault(columns, []).append(settings)
+
+        await self._submit([
+            (_upsert_sql(columns), [_to_row(settings) for settings in group])
+            for columns, group in groups.items()
+        ])
+        for settings in settings_list:
+            self._cache_settings(settings)
 
     async def delete_settings(self, user_id: str) -> None:
         """Delete settings for a specific user."""
-        with sqlite3.connect(self.db_file) as conn:
-            conn.execute(
-                "DELETE FROM admin_settings WHERE user_id = ?",
-                (user_id,)
-            )
+        await self._submit([("DELETE FROM admin_settings WHERE user_id = ?", [(user_id,)])])
+        self._cache.pop(user_id, None)
+
+    def close(self) -> None:
+        """Stop the writer thread and close both database connections."""
+        self._write_queue.put(None)
+        self._writer.join()
+        self._read_conn.close()
+        self._write_conn.close()
 
     @staticmethod
     def generate_user_id() -> str:
@@ -3,9 +3,9 @@ Blog Writer Agent for generating blog content from processed data.
 """
 from typing import Dict, List, Optional
 from datetime import datetime
-import json
 from phi.agent import Agent
 from phi.llm.openai import OpenAIChat
+from ..utils import llm_json
 
 
 class BlogWriterAgent(Agent):
@@ -146,7 +146,7 @@ Example output format:
         """Create the blog post structure."""
         prompt = f"""Create a blog post structure for:
 Focus: {focus}
-Context: {json.dumps(context)}
+Context: {llm_json.dumps(context)}
 Scope: {', '.join(scope)}
 
 Return a JSON object with:
@@ -156,20 +156,20 @@ Return a JSON object with:
 4. target keywords
 
 Use the source material themes:
-{json.dumps([s['title'] for s in sources], indent=2)}"""
+{llm_json.dumps([s['title'] for s in sources], indent=True)}"""
 
         response = self.llm.complete(prompt)
-        return json.loads(response)
+        return llm_json.loads(response)
     
     def _write_section(self, section_type: str, section_focus: str, sources: List[Dict]) -> Dict:
         """Write a single blog section."""
         prompt = f"""Write a {section_type} section about {section_focus}.
 
 Use these sources:
-{json.dumps([{
+{llm_json.dumps([{
     'title': s['title'],
     'key_points': s['key_points']
-} for s in sources], indent=2)}
+} for s in sources], indent=True)}
 
 Return a JSON object with:
 1. type: section type
@@ -177,7 +177,7 @@ Return a JSON object with:
 3. sources_used: list of source URLs used"""
 
         response = self.llm.complete(prompt)
-        return json.loads(response)
+        return llm_json.loads(response)
     
     def _suggest_images(self, processed_data: Dict, sections: List[Dict]) -> List[Dict]:
         """Suggest images for each section."""
@@ -208,12 +208,12 @@ Return a JSON object with:
 {content[:500]}...
 
 Available images:
-{json.dumps(images, indent=2)}
+{llm_json.dumps(images, indent=True)}
 
 Return a JSON array of image objects that would best illustrate this content."""
 
         response = self.llm.complete(prompt)
-        return json.loads(response)
+        return llm_json.loads(response)
     
     def _format_sources(self, sources: List[Dict]) -> List[Dict]:
         """Format sources for citation."""
@@ -3,10 +3,10 @@ Image Creation Agent for generating visuals from blog content.
 """
 from typing import Dict, List, Optional
 from datetime import datetime
-import json
 import os
 from phi.agent import Agent
 from phi.llm.openai import OpenAIChat
+from ..utils import llm_json
 
 
 class ImageCreationAgent(Agent):
@@ -120,7 +120,7 @@ Example output format:
         prompt = f"""Analyze this blog content and determine image needs:
 
 Title: {blog_content['blog_post']['title']}
-Sections: {json.dumps(blog_content['blog_post']['sections'], indent=2)}
+Sections: {llm_json.dumps(blog_content['blog_post']['sections'], indent=True)}
 
 Return a JSON array of image needs with:
 1. section (which section needs the image)
@@ -131,7 +131,7 @@ Return a JSON array of image needs with:
 6. content (key elements to include)"""
 
         response = self.llm.complete(prompt)
-        return json.loads(response)
+        return llm_json.loads(response)
     
     def _generate_prompt(self, section_type: str, content: str, style: str) -> str:
         """Generate a DALL-E prompt for the image."""
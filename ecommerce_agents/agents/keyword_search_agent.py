@@ -23,16 +23,74 @@ Example:
 """
 from datetime import datetime, timezone
 from typing import Dict, Any, List, Optional, Set, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from urllib.parse import urlparse
 import re
+import asyncio
+import operator
 from phi.agent import Agent
 from ecommerce_agents.tools.duckduckgo_tool import DuckDuckGoSearchTool
+from ecommerce_agents.utils.cache import TTLCache
 import logging
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Text cleaning patterns, compiled once at import time
+_WS_RE = re.compile(r'\s+')
+# Translation table that drops C0/C1 control characters
+_CTRL_TABLE = dict.fromkeys(range(0, 32)) | dict.fromkeys(range(127, 160))
+# Joins a batch of texts so they can be cleaned in one pass; a Unicode
+# noncharacter that should never appear in real page text
+_BATCH_SEP = '\uffff'
+# Fast path for scheme, netloc and path of absolute URLs
+_URL_RE = re.compile(r'^([a-zA-Z][a-zA-Z0-9+.\-]*)://([^/?#]+)([^?#]*)')
+
+# DuckDuckGoSearchTool maps every result to these keys, so one itemgetter call
+# replaces five dict.get lookups
+_GET_FIELDS = operator.itemgetter("title", "link", "body", "published", "source")
+
+def _result_fields(result: Dict[str, Any]) -> Tuple[Any, ...]:
+    """Return (title, link, body, published, source) for a raw result."""
+    try:
+        return _GET_FIELDS(result)
+    except KeyError:
+        return (
+            result.get("title", "Untitled"),
+            result.get("link", ""),
+            result.get("body", "No description available"),
+            result.get("published"),
+            result.get("source")
+        )
+
+def _clean_texts(texts: List[str]) -> List[str]:
+    """
+    Clean a batch of texts with a single regex pass and a single translate pass.
+    
+    Equivalent to calling SearchResult._clean_text on each item, but the C-level
+    scans run once over the joined batch instead of once per text.
+    """
+    joined = _BATCH_SEP.join(texts)
+    if joined.count(_BATCH_SEP) != len(texts) - 1:
+        # A text contains the separator itself, so it can't be split back safely
+        return [SearchResult._clean_text(text) for text in texts]
+    cleaned = _WS_RE.sub(' ', joined).translate(_CTRL_TABLE)
+    return [text.strip() for text in cleaned.split(_BATCH_SEP)]
+
+def _normalize_url(url: str) -> Tuple[str, str]:
+    """Return the lowercased domain and the scheme://domain/path form of a URL."""
+    match = _URL_RE.match(url)
+    # urlparse splits ;params off the path, so leave those URLs to it
+    if match and ';' not in match.group(3):
+        scheme, netloc, path = match.groups()
+        domain = netloc.lower()
+        # urlparse lowercases the scheme too, so both paths dedupe alike
+        return domain, f"{scheme.lower()}://{domain}{path}"
+    # Fall back to the full parser for anything without an explicit scheme://netloc
+    parsed_url = urlparse(url)
+    domain = parsed_url.netloc.lower()
+    return domain, f"{parsed_url.scheme}://{domain}{parsed_url.path}"
+
+@dataclass(slots=True)
 class SearchQuery:
     """
     Represents a processed search query with metadata.
@@ -44,6 +102,7 @@ class SearchQuery:
         region: Geographic region for results
         timelimit: Time limit for result freshness
         timestamp: UTC timestamp of query creation
+        search_terms: Lowercased query terms, parsed once per query
     """
     original_query: str
     parsed_query: str
@@ -51,13 +110,15 @@ class SearchQuery:
     region: str = "wt-wt"
     timelimit: Optional[str] = None
     timestamp: str = ""
+    search_terms: Tuple[str, ...] = field(init=False, default=())
 
     def __post_init__(self):
-        """Initialize timestamp if not provided."""
+        """Initialize timestamp if not provided and parse the query terms."""
         if not self.timestamp:
             self.timestamp = datetime.now(timezone.utc).isoformat()
+        self.search_terms = tuple(self.original_query.lower().split())
 
-@dataclass
+@dataclass(slots=True)
 class SearchResult:
     """
     Represents an enriched search result with metadata.
@@ -91,9 +152,7 @@ class SearchResult:
             self.timestamp = datetime.now(timezone.utc).isoformat()
         
         # Parse and normalize URL
-        parsed_url = urlparse(self.url)
-        self.domain = parsed_url.netloc.lower()
-        self.normalized_url = f"{parsed_url.scheme}://{parsed_url.netloc.lower()}{parsed_url.path}"
+        self.domain, self.normalized_url = _normalize_url(self.url)
         
         # Clean text fields
         self.title = self._clean_text(self.title)
@@ -103,14 +162,41 @@ class SearchResult:
         if self.date:
             self.date = self._normalize_date(self.date)
     
+    @classmethod
+    def from_cleaned(cls,
+                     title: str,
+                     url: str,
+                     description: str,
+                     date: Optional[str],
+                     source: Optional[str],
+                     query: SearchQuery,
+                     timestamp: str,
+                     domain: str,
+                     normalized_url: str
+                     ) -> "SearchResult":
+        """
+        Build a result from fields that were already cleaned and normalized.
+        
+        Skips __post_init__ so batch callers don't redo the text and URL work.
+        """
+        result = cls.__new__(cls)
+        result.title = title
+        result.url = url
+        result.description = description
+        result.date = cls._normalize_date(date) if date else date
+        result.source = source
+        result.query = query
+        result.timestamp = timestamp
+        result.relevance_score = 0.0
+        result.domain = domain
+        result.normalized_url = normalized_url
+        return result
+
     @staticmethod
     def _clean_text(text: str) -> str:
         """Clean and normalize text content."""
-        # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text).strip()
-        # Remove non-printable characters
-        text = ''.join(char for char in text if char.isprintable())
-        return text
+        # Collapse whitespace and drop control characters in two C-level passes
+        return _WS_RE.sub(' ', text).translate(_CTRL_TABLE).strip()
     
     @staticmethod
     def _normalize_date(date_str: str) -> str:
@@ -154,30 +240,44 @@ class KeywordSearchAgent(Agent):
     
     type: str = "KeywordSearchAgent"
     search_tool: Optional[DuckDuckGoSearchTool] = None
+    # Raw DuckDuckGo results keyed by (query, region, max_results, timelimit)
+    result_cache: Optional[TTLCache] = None
+    # Relevance scores keyed by (query, url), reused when a page recurs across searches
+    score_cache: Optional[TTLCache] = None
+    # Bounds concurrent DuckDuckGo requests to stay under its rate limits
+    search_semaphore: Optional[asyncio.Semaphore] = None
 
     def __init__(self, **kwargs):
         """Initialize the agent."""
         super().__init__(**kwargs)
         self.search_tool = DuckDuckGoSearchTool()
+        self.result_cache = TTLCache(maxsize=1024, ttl=3600)
+        self.score_cache = TTLCache(maxsize=50_000)
+        self.search_semaphore = asyncio.Semaphore(2)
+
+    @staticmethod
+    def _count_terms(search_terms: Tuple[str, ...], text: str) -> int:
+        """Count the query terms found in text, each checked on its own so overlapping terms all count."""
+        text = text.lower()
+        return sum(term in text for term in search_terms)
 
-    def _calculate_relevance(self, result: Dict[str, Any], query: SearchQuery) -> float:
-        """Calculate relevance score for a result based on query match."""
-        # Simple relevance calculation based on exact query matches
+    def _calculate_relevance(self, title: str, description: str, search_terms: Tuple[str, ...]) -> float:
+        """Calculate relevance score for a cleaned title and description based on query match."""
+        # Simple relevance calculation based on exact query matches:
+        # each term found adds 0.5 in the title and 0.3 in the description
+        if not search_terms:
+            return 0.0
         relevance = 0.0
-        search_terms = query.original_query.lower().split()
-        
+
         # Check title
-        title = result.get("title", "").lower()
-        for term in search_terms:
-            if term in title:
-                relevance += 0.5
-                
+        relevance += 0.5 * self._count_terms(search_terms, title)
+        # The score is capped at 1.0, so the description can't change it
+        if relevance >= 1.0:
+            return 1.0
+
         # Check description
-        description = result.get("description", "").lower()
-        for term in search_terms:
-            if term in description:
-                relevance += 0.3
-                
+        relevance += 0.3 * self._count_terms(search_terms, description)
+
         return min(relevance, 1.0)
 
     async def search(self,
@@ -186,7 +286,8 @@ class KeywordSearchAgent(Agent):
                     category: str = None,
                     region: str = "wt-wt",
                     max_results: int = 10,
-                    timelimit: Optional[str] = None
+                    timelimit: Optional[str] = None,
+                    timestamp: Optional[str] = None
                     ) -> List[SearchResult]:
         """
         Perform a simple keyword search using DuckDuckGo.
@@ -198,66 +299,102 @@ class KeywordSearchAgent(Agent):
             region: Region for search results
             max_results: Maximum number of results to return
             timelimit: Time limit for results ('d' for day, 'w' for week, 'm' for month)
+            timestamp: ISO timestamp to stamp the query and results with (defaults to now)
         """
+        # One timestamp shared by the query and all of its results
+        current_time = timestamp or datetime.now(timezone.utc).isoformat()
+        
         # Create a search query object
         search_query = SearchQuery(
             original_query=query,
             parsed_query=query,
             category=category,
             region=region,
-            timelimit=timelimit
+            timelimit=timelimit,
+            timestamp=current_time
         )
+        # Parsed once per search and shared by every result's relevance calculation
+        search_terms = search_query.search_terms
         
         try:
-            # Perform the search using the async method
-            raw_results = await self.search_tool._arun(
-                query=query,
-                max_results=max_results,
-                region=region,
-                timelimit=timelimit
-            )
+            # Reuse cached raw results so repeated queries skip DuckDuckGo and its rate limits
+            cache_key = (query, region, max_results, timelimit)
+            raw_results = self.result_cache.get(cache_key)
+            if raw_results is None:
+                # Perform the search using the async method
+                async with self.search_semaphore:
+                    raw_results = await self.search_tool._arun(
+                        query=query,
+                        max_results=max_results,
+                        region=region,
+                        timelimit=timelimit
+                    )
+                # Empty results usually mean an error or rate limit, so don't cache them
+                if raw_results:
+                    self.result_cache.set(cache_key, raw_results)
+            else:
+                logger.info("Using cached results")
             
             logger.info(f"Got {len(raw_results)} raw results")
             
+            # Only prepare results we may return; keep a margin for the ones
+            # dropped below for empty or duplicate URLs
+            raw_results = raw_results[:max_results * 2]
+            
             # Process results
             results = []
-            current_time = datetime.now(timezone.utc).isoformat()
+            seen_urls: Set[str] = set()
             
-            for result in raw_results:
+            # Clean text and parse URLs for the whole batch up front, then build
+            # the result objects from the prepared columns
+            fields = [_result_fields(r) for r in raw_results]
+            titles = _clean_texts([f[0] or "" for f in fields])
+            urls = [f[1] or "" for f in fields]  # This will now contain the URL from 'href' field mapped in DuckDuckGoSearchTool
+            descriptions = _clean_texts([f[2] or "" for f in fields])
+            parsed_urls = [_normalize_url(url) for url in urls]
+            
+            for result, (_, _, _, published, source), title, description, url, (domain, normalized_url) in zip(
+                raw_results, fields, titles, descriptions, urls, parsed_urls
+            ):
                 if len(results) >= max_results:
                     break
                 
                 try:
-                    # Debug print the raw result
-                    print("\nProcessing result:")
-                    print(f"Raw result keys: {result.keys()}")
+                    logger.debug("Processing result keys=%s url=%s", result.keys(), url)
                     
-                    url = result.get("link", "")  # This will now contain the URL from 'href' field mapped in DuckDuckGoSearchTool
-                    print(f"URL from result: {url}")
+                    # Skip results with empty URLs
+                    if not url:
+                        logger.warning("Skipping result with empty URL")
+                        continue
+                    
+                    # Skip pages already returned under another query-string variant
+                    if normalized_url in seen_urls:
+                        logger.debug("Skipping duplicate result: %s", normalized_url)
+                        continue
+                    seen_urls.add(normalized_url)
                     
-                    # Create SearchResult object with safe field access
-                    search_result = SearchResult(
-                        title=result.get("title", "Untitled"),
+                    # Create SearchResult object from the pre-normalized fields
+                    search_result = SearchResult.from_cleaned(
+                        title=title,
                         url=url,
-                        description=result.get("body", "No description available"),
-                        date=result.get("published"),
-                        source=result.get("source"),
+                        description=description,
+                        date=published,
+                        source=source,
                         query=search_query,
-                        timestamp=current_time
+                        timestamp=current_time,
+                        domain=domain,
+                        normalized_url=normalized_url
                     )
                     
-                    # Debug print the URL
-                    logger.debug(f"URL from result: {search_result.url}")
-                    
-                    # Skip results with empty URLs
-                    if not search_result.url:
-                        logger.warning("Skipping result with empty URL")
-                        continue
-                    
                     # Calculate relevance
-                    search_result.relevance_score = self._calculate_relevance(result, search_query)
+                    score_key = (query, url)
+                    score = self.score_cache.get(score_key)
+                    if score is None:
+                        score = self._calculate_relevance(title, description, search_terms)
+                        self.score_cache.set(score_key, score)
+                    search_result.relevance_score = score
                     results.append(search_result)
-                    logger.info(f"Added result: {search_result.title}")
+                    logger.info("Added result: %s", search_result.title)
                     
                 except Exception as e:
                     logger.warning(f"Error processing search result: {str(e)}")
@@ -271,6 +408,26 @@ class KeywordSearchAgent(Agent):
             logger.exception("Full traceback:")
             return []
 
+    async def search_many(self, queries: List[str], **kwargs) -> List[Any]:
+        """
+        Run several searches concurrently.
+        
+        DuckDuckGo requests are bounded by ``search_semaphore``; cached queries
+        return without waiting on it.
+        
+        Args:
+            queries: Search queries to run
+            **kwargs: Parameters forwarded to ``search`` for every query
+            
+        Returns:
+            One entry per query, in order: the list of results, or the
+            exception raised for that query
+        """
+        return await asyncio.gather(
+            *(self.search(query, **kwargs) for query in queries),
+            return_exceptions=True
+        )
+
     async def run(self, user_id: str, query: str, **kwargs) -> Dict[str, Any]:
         """
         Run the agent with the given query.
@@ -284,10 +441,13 @@ class KeywordSearchAgent(Agent):
                 - max_results: Result limit
                 - timelimit: Time window
         """
+        # Reused for the query, its results and the response envelope
+        now_iso = datetime.now(timezone.utc).isoformat()
         try:
             results = await self.search(
                 query=query,
                 user_id=user_id,
+                timestamp=now_iso,
                 **kwargs
             )
             
@@ -295,7 +455,7 @@ class KeywordSearchAgent(Agent):
                 "query": query,
                 "results": [r.to_dict() for r in results],
                 "total_results": len(results),
-                "timestamp": datetime.now(timezone.utc).isoformat()
+                "timestamp": now_iso
             }
             
         except Exception as e:
@@ -304,6 +464,6 @@ class KeywordSearchAgent(Agent):
                 "query": query,
                 "results": [],
                 "total_results": 0,
-                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "timestamp": now_iso,
                 "error": str(e)
             }
@@ -9,23 +9,365 @@ This agent uses LLM capabilities to:
 
 The agent maintains session state and uses caching to improve performance.
 """
-from typing import Dict, Any, List, Optional, Tuple, ClassVar
-import json
+from typing import Dict, Any, List, Optional, Tuple, ClassVar, Callable, Awaitable, AsyncIterator
+from functools import lru_cache
+from pydantic import BaseModel, ConfigDict, Field
+import orjson
 from datetime import datetime
-from langdetect import detect
 from phi.agent import Agent, RunResponse, AgentSession
-from openai import AsyncOpenAI
+from openai import AsyncOpenAI, DefaultAioHttpClient, RateLimitError, APIConnectionError, InternalServerError
+from openai.lib._pydantic import to_strict_json_schema
+from tenacity import AsyncRetrying, retry_if_exception_type, stop_after_attempt, wait_random_exponential
 from phi.storage.agent.sqlite import SqlAgentStorage
+from ecommerce_agents.utils.cache import SemanticCache, TTLCache
 import uuid
+import copy
+import weakref
 import asyncio
 import os
 import re
+import httpx
+import logging
 
 # Words that indicate temporal context
-TEMPORAL_TERMS: ClassVar[List[str]] = [
+TEMPORAL_TERMS: frozenset = frozenset({
     "recent", "current", "latest", "upcoming", "future",
     "past", "previous", "historical", "next", "last"
-]
+})
+
+# Product categories whose trends follow the seasons
+SEASONAL_CATEGORIES: frozenset = frozenset({
+    "clothing", "footwear", "accessories", "sports equipment",
+    "outdoor gear", "swimwear", "beachwear"
+})
+
+# Continents used directly as location search terms
+CONTINENTS: frozenset = frozenset({
+    "europe", "asia", "africa", "north america", "south america", "australia"
+})
+
+logger = logging.getLogger(__name__)
+
+# Season for each month (index 0 is January) and the season that follows each one
+_MONTH_TO_SEASON: Tuple[str, ...] = (
+    "Winter", "Winter", "Spring", "Spring", "Spring", "Summer",
+    "Summer", "Summer", "Fall", "Fall", "Fall", "Winter"
+)
+_NEXT_SEASON: Dict[str, str] = {
+    "Winter": "Spring",
+    "Spring": "Summer",
+    "Summer": "Fall",
+    "Fall": "Winter"
+}
+_PREVIOUS_SEASON: Dict[str, str] = {season: previous for previous, season in _NEXT_SEASON.items()}
+# Upcoming season for each month (index 0 is January)
+_MONTH_TO_UPCOMING_SEASON: Tuple[str, ...] = tuple(_NEXT_SEASON[season] for season in _MONTH_TO_SEASON)
+# Month each season is referred to by in temporal search terms
+_SEASON_MONTH: Dict[str, str] = {
+    "Spring": "March",
+    "Summer": "June",
+    "Fall": "September",
+    "Winter": "December"
+}
+
+# Transient OpenAI failures worth retrying before giving up on a call. APIConnectionError
+# covers request timeouts, TimeoutError the wait_for guard in _call_llm
+_RETRYABLE_ERRORS = (RateLimitError, APIConnectionError, InternalServerError, TimeoutError)
+
+# Structured output schemas for each LLM call
+class CategoryResult(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    category: str = Field(description="Broad, standardized product category name")
+
+class QueryAnalysis(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    focus_term: Optional[str] = Field(description="Product term, can be compound like 'running shoes' or 'winter boots'")
+    objective: Optional[str] = Field(description="Single research objective: trends, demand, performance or comparison")
+    scope: Optional[str] = Field(description="Single analysis area: functionality, sustainability, technology, health, price or culture")
+    temporal_context: Optional[str] = Field(description="Single time reference")
+    geographical_context: Optional[str] = Field(description="Single location reference")
+    category: Optional[str] = Field(description="Broad product category of the focus term")
+    unmatched_terms: List[str] = Field(description="Terms that don't fit any component")
+
+class QueryEnrichment(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    objective: List[str] = Field(description="1 synonym for the objective")
+    focus: List[str] = Field(description="2-3 related terms for the focus")
+    scope: List[str] = Field(description="Up to 5 relevant terms about the scope, empty if there is no scope")
+
+class QueryPipeline(QueryAnalysis):
+    enrichment: QueryEnrichment = Field(description="Related terms for the analyzed objective, focus and scope")
+
+class SemanticQueries(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    queries: List[str] = Field(description="5 research questions")
+
+class ValidationResult(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    is_valid: bool
+    suggestion: str = Field(description="Suggested correction if invalid, empty if valid")
+
+@lru_cache(maxsize=None)
+def _response_format(schema: type[BaseModel]) -> Dict[str, Any]:
+    """Build a strict structured-output response_format for a schema model."""
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": schema.__name__,
+            # The SDK's strict conversion inlines $refs that carry sibling keys
+            # (e.g. a description on a nested model), which strict mode rejects
+            "schema": to_strict_json_schema(schema),
+            "strict": True
+        }
+    }
+
+# Prompt templates, filled in with str.format at call time. The output shape
+# is enforced by the matching schema, so prompts only describe the task
+_CATEGORY_PROMPT = """Return the product category for: "{focus_term}"
+Prefer one of: {categories}.
+Otherwise use a similarly broad, standardized category."""
+
+_ANALYSIS_PROMPT = """Analyze this market research query: "{query}"
+For the category, prefer one of: {categories}.
+
+Important:
+- Focus can be a compound term (e.g., 'running shoes', 'dress boots') but should not include scope modifiers
+- Scope modifiers like 'sustainable', 'smart', 'eco-friendly' should be part of scope, not focus
+- Objective must be one of: trends, demand, performance, comparison
+- Scope must be one of: functionality, sustainability, technology, health, price, culture
+- Only include terms that are explicitly mentioned in the query, use null for missing components"""
+
+_PIPELINE_PROMPT = _ANALYSIS_PROMPT + """
+- For the enrichment, provide related terms for the focus, objective and scope found above
+- Keep enrichment terms concise and directly relevant to the query"""
+
+_ENRICHMENT_PROMPT = """Given a focus on {focus} with objective {objective} and scope {scope}, provide related terms.
+Keep terms concise and directly relevant to the current context."""
+
+_SEMANTIC_QUERIES_PROMPT = """Generate 5 research questions about {focus}.
+
+Use these components:
+- Objective: {objective} ({objective_terms})
+- Time frame: {temporal}
+- Location: {location}
+- Scope: {scope}
+
+Guidelines:
+1. First question should be very close to the original query
+2. Other questions should explore different perspectives
+3. Keep questions general and high-level
+4. Avoid too specific or technical details
+5. Make questions simple and direct
+
+Example questions:
+- What are the [objective] for [product] in [location]?
+- How is the market evolving?
+- What are the main influencing factors?
+- What direction is this heading?
+- Why do people make these choices?"""
+
+_VALIDATE_OBJECTIVE_PROMPT = """Is this objective "{objective}" relevant for customer research?
+Valid objectives include: trends, comparison, performance, analysis, demand, preferences, etc.
+Suggest a correction if it is invalid."""
+
+_VALIDATE_GEOGRAPHICAL_PROMPT = """Is this geographical context "{geo_context}" valid for customer research?
+Valid formats: global, continent names, country names, regions, major cities, etc.
+Suggest a correction if it is invalid."""
+
+_VALIDATE_SCOPE_PROMPT = """Is this scope/analysis area "{scope}" relevant for customer research?
+Valid areas include: functionality, sustainability, technology, design, price, quality, etc.
+Suggest a correction if it is invalid."""
+
+# Plurals the suffix rules in _singular would get wrong
+_IRREGULAR_SINGULARS = {"scarves": "scarf", "pants": "pants"}
+
+def _singular(term: str) -> str:
+    """Naive English singular of a plural product term, e.g. "watches" -> "watch"."""
+    if term in _IRREGULAR_SINGULARS:
+        return _IRREGULAR_SINGULARS[term]
+    if term.endswith("ies"):
+        return term[:-3] + "y"
+    if term.endswith(("ches", "shes", "sses", "xes")):
+        return term[:-2]
+    if term.endswith("s") and not term.endswith("ss"):
+        return term[:-1]
+    return term
+
+def _category_index(product_categories: Dict[str, List[str]]) -> Dict[str, str]:
+    """
+    Map each category name, product and singular product to its category.
+    
+    Category names take precedence over products, and singulars are derived from
+    the resulting map, so a product listed under several categories (e.g.
+    "accessories") resolves the same way in both forms. A singular never
+    replaces an existing term.
+    """
+    index = {product: category for category, products in product_categories.items() for product in products}
+    index.update({category: category for category in product_categories})
+    for term, category in list(index.items()):
+        index.setdefault(_singular(term), category)
+    return index
+
+def _cue_patterns(
+    objective_terms: Dict[str, List[str]],
+    scope_patterns: Dict[str, str]
+) -> Tuple[Tuple[str, re.Pattern], ...]:
+    """
+    Compile one pattern per research objective and scope area that matches the
+    words cueing it in a lowercased query.
+    
+    Objective words and scope names match as prefixes, so "trend" also finds
+    "trends" and "trending".
+    """
+    patterns = [
+        (objective, re.compile(r"\b(" + "|".join(map(re.escape, [_singular(objective), *terms])) + ")"))
+        for objective, terms in objective_terms.items()
+    ]
+    patterns.extend(
+        (scope, re.compile(rf"{pattern}|\b{re.escape(scope)}")) for scope, pattern in scope_patterns.items()
+    )
+    return tuple(patterns)
+
+def _text(value: Any) -> Optional[str]:
+    """Return value stripped if it is a non-blank string, otherwise None."""
+    if isinstance(value, str):
+        value = value.strip()
+        if value:
+            return value
+    return None
+
+def _normalize(text: str) -> str:
+    """Lowercase text and collapse its whitespace, so equivalent inputs share cache entries."""
+    return " ".join(text.lower().split())
+
+class _JsonStringArrayScanner:
+    """
+    Incrementally extract the strings of the first JSON array in a streamed
+    payload such as {"queries": ["...", "..."]}.
+    """
+    def __init__(self):
+        self._buffer = ""
+        self._pos = 0
+        self._in_array = False
+        self._string_start = -1
+        self._escaped = False
+
+    def feed(self, text: str) -> List[str]:
+        """Consume more text and return the array strings completed by it."""
+        self._buffer += text
+        completed = []
+        buffer = self._buffer
+        for pos in range(self._pos, len(buffer)):
+            char = buffer[pos]
+            if self._string_start >= 0:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    if self._in_array:
+                        completed.append(orjson.loads(buffer[self._string_start:pos + 1]))
+                    self._string_start = -1
+            elif char == '"':
+                self._string_start = pos
+            elif char == "[":
+                self._in_array = True
+            elif char == "]":
+                self._in_array = False
+        self._pos = len(buffer)
+        return completed
+
+class _JsonFieldScanner:
+    """
+    Incrementally extract the top-level string fields of a streamed JSON object,
+    e.g. ("objective", "trends") as soon as that value's closing quote arrives.
+    """
+    def __init__(self):
+        self._buffer = ""
+        self._pos = 0
+        self._depth = 0
+        self._expect_key = False
+        self._key = None
+        self._string_start = -1
+        self._escaped = False
+
+    def feed(self, text: str) -> List[Tuple[str, str]]:
+        """Consume more text and return the (key, value) string fields completed by it."""
+        self._buffer += text
+        completed = []
+        buffer = self._buffer
+        for pos in range(self._pos, len(buffer)):
+            char = buffer[pos]
+            if self._string_start >= 0:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    if self._depth == 1:
+                        string = orjson.loads(buffer[self._string_start:pos + 1])
+                        if self._expect_key:
+                            self._key = string
+                        elif self._key is not None:
+                            completed.append((self._key, string))
+                    self._string_start = -1
+            elif char == '"':
+                self._string_start = pos
+            elif char in "{[":
+                self._depth += 1
+                self._expect_key = self._depth == 1 and char == "{"
+            elif char in "}]":
+                self._depth -= 1
+            elif self._depth == 1:
+                if char == ",":
+                    self._expect_key = True
+                elif char == ":":
+                    self._expect_key = False
+        self._pos = len(buffer)
+        return completed
+
+# One OpenAI client, and so one connection pool, shared by every agent instance
+# running on the same event loop. The aiohttp session behind a client is bound to
+# the loop it was created on, so each loop (e.g. each asyncio.run) gets its own
+_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncOpenAI]" = weakref.WeakKeyDictionary()
+
+def get_client() -> AsyncOpenAI:
+    """Return the OpenAI client shared on the running event loop, creating it on first use."""
+    loop = asyncio.get_running_loop()
+    client = _CLIENTS.get(loop)
+    if client is None:
+        # aiohttp transport holds up far better than the default httpx one under
+        # the many concurrent completions these agents issue
+        client = AsyncOpenAI(
+            api_key=os.getenv("OPENAI_API_KEY"),
+            # Retries are handled with backoff in UserQueryAgent._call_llm
+            max_retries=0,
+            # Upper bound for any request; _call_llm sets tighter per-call limits
+            timeout=httpx.Timeout(30.0, connect=3.0),
+            http_client=DefaultAioHttpClient(
+                limits=httpx.Limits(max_connections=200, max_keepalive_connections=200, keepalive_expiry=60)
+            )
+        )
+        _CLIENTS[loop] = client
+    return client
+
+async def close_client() -> None:
+    """Close the running event loop's shared client; the next get_client() call creates a new one."""
+    client = _CLIENTS.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.close()
+
+def _reset_client_after_fork() -> None:
+    """Drop the inherited clients in a forked worker so it opens its own connections."""
+    _CLIENTS.clear()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_client_after_fork)
 
 class UserQueryAgent(Agent):
     """
@@ -43,8 +385,42 @@ class UserQueryAgent(Agent):
     
     Attributes:
         client (AsyncOpenAI): OpenAI API client for LLM interactions
+        category_cache (TTLCache): Product categories keyed by normalized focus term
+        semantic_cache (SemanticCache): LLM results keyed by query embedding
+        completion_cache (TTLCache): Chat completions keyed by their exact request
+        result_cache (TTLCache): Analysis and enrichment results keyed by normalized input
     """
 
+    # Product categories already resolved, so repeat focus terms skip the LLM
+    category_cache: Optional[TTLCache] = None
+    # LLM results for semantically equivalent queries
+    semantic_cache: Optional[SemanticCache] = None
+    # Chat completions for identical requests, e.g. repeat validator prompts
+    completion_cache: Optional[TTLCache] = None
+    # Analysis and enrichment results for repeat queries in a session
+    result_cache: Optional[TTLCache] = None
+
+    # Models used for LLM calls: the small model handles short structured-JSON
+    # subtasks, the large one the analysis and final search queries
+    SMALL_MODEL: ClassVar[str] = "gpt-4o-mini"
+    LARGE_MODEL: ClassVar[str] = "gpt-4o"
+    # Output token caps for the short yes/no and single-label replies, enough
+    # for a brief suggestion but no rambling
+    VALIDATION_MAX_TOKENS: ClassVar[int] = 40
+    CATEGORY_MAX_TOKENS: ClassVar[int] = 20
+    # Seconds a single completion attempt may take: short replies from the small
+    # model get a tighter bound than the analysis and query generation calls
+    FAST_LLM_TIMEOUT: ClassVar[float] = 10.0
+    LLM_TIMEOUT: ClassVar[float] = 20.0
+    # Attempts _call_llm makes at a completion before giving up
+    LLM_MAX_ATTEMPTS: ClassVar[int] = 5
+    # Enrichment sub-calls make fewer, shorter attempts so their retries fit in
+    # ENRICHMENT_TIMEOUT, the wall-clock seconds each may take before its default
+    # is used instead (the single backoff wait between attempts is at most 1s)
+    ENRICHMENT_ATTEMPTS: ClassVar[int] = 2
+    ENRICHMENT_ATTEMPT_TIMEOUT: ClassVar[float] = 2.0
+    ENRICHMENT_TIMEOUT: ClassVar[float] = ENRICHMENT_ATTEMPTS * ENRICHMENT_ATTEMPT_TIMEOUT + 1.0
+
     # Standard scope areas for market analysis
     STANDARD_SCOPE_AREAS: ClassVar[List[str]] = [
         "functionality",
@@ -70,6 +446,17 @@ class UserQueryAgent(Agent):
         "sports": ["equipment", "apparel", "accessories", "footwear"]
     }
 
+    # Category names as listed in prompts
+    CATEGORY_NAMES: ClassVar[str] = ", ".join(PRODUCT_CATEGORIES)
+
+    # Category for each category name, product and singular product
+    CATEGORY_INDEX: ClassVar[Dict[str, str]] = _category_index(PRODUCT_CATEGORIES)
+    # Every CATEGORY_INDEX term as whole words, longest first, so one scan finds
+    # all known products in a lowercased text
+    PRODUCT_REGEX: ClassVar[re.Pattern] = re.compile(
+        r"\b(" + "|".join(sorted(map(re.escape, CATEGORY_INDEX), key=len, reverse=True)) + r")\b"
+    )
+
     # Pattern matching constants
     TEMPORAL_PATTERNS: ClassVar[Dict[str, str]] = {
         'year': r'\b(20\d{2})\b',
@@ -83,6 +470,15 @@ class UserQueryAgent(Agent):
         'global': r'\b(global|worldwide|international)\b',
         'continent': r'\b(europe|asia|africa|north america|south america|australia)\b'
     }
+
+    # Temporal and location patterns fused into one regex so a single scan finds
+    # every match; groups are named "<kind>_<pattern type>" and numbered in
+    # pattern order. Queries are lowercased before matching
+    CONTEXT_REGEX: ClassVar[re.Pattern] = re.compile("|".join(
+        f"(?P<{kind}_{pattern_type}>{pattern})"
+        for kind, patterns in (("temporal", TEMPORAL_PATTERNS), ("location", LOCATION_PATTERNS))
+        for pattern_type, pattern in patterns.items()
+    ))
     
     OBJECTIVE_TERMS: ClassVar[Dict[str, List[str]]] = {
         'trends': ['pattern', 'movement', 'direction', 'shift', 'evolution'],
@@ -100,6 +496,9 @@ class UserQueryAgent(Agent):
         'price': r'\b(price|cost|affordable|premium|luxury)\b',
         'culture': r'\b(cultural|social|lifestyle|demographic)\b'
     }
+    # Objective and scope cues, so paraphrases only share a cached analysis
+    # when they ask for the same objective and scope
+    ANALYSIS_CUE_PATTERNS: ClassVar[Tuple[Tuple[str, re.Pattern], ...]] = _cue_patterns(OBJECTIVE_TERMS, SCOPE_PATTERNS)
 
     def __init__(self, storage=None, **kwargs):
         """
@@ -113,8 +512,113 @@ class UserQueryAgent(Agent):
             storage = SqlAgentStorage(table_name="user_query_agent")
             
         super().__init__(storage=storage, **kwargs)
-        object.__setattr__(self, "client", AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY")))
+        self.category_cache = TTLCache(maxsize=1024)
+        self.semantic_cache = SemanticCache(maxsize=1024, threshold=0.1, ttl=3600)
+        self.completion_cache = TTLCache(maxsize=4096, ttl=3600)
+        self.result_cache = TTLCache(maxsize=1024, ttl=3600)
+
+    @property
+    def client(self) -> AsyncOpenAI:
+        """OpenAI client shared by all agent instances on the running event loop."""
+        return get_client()
+
+    async def close(self) -> None:
+        """Release the HTTP session of the shared OpenAI client."""
+        await close_client()
+        
+    async def _call_llm(
+        self,
+        messages: List[Dict[str, str]],
+        model: str,
+        timeout: Optional[float] = None,
+        attempts: Optional[int] = None,
+        **kwargs
+    ) -> Any:
+        """
+        Create a chat completion, retrying transient API errors with jittered backoff.
+        
+        Each of up to attempts tries (LLM_MAX_ATTEMPTS by default) is bounded by
+        timeout seconds (LLM_TIMEOUT by default), so a stalled request is retried
+        instead of holding its coroutine and connection. For streams this bounds
+        the wait for the response to start.
         
+        Non-streamed completions are cached by their exact request, so identical
+        prompts with the same model and parameters skip the API entirely.
+        """
+        timeout = timeout or self.LLM_TIMEOUT
+        attempts = attempts or self.LLM_MAX_ATTEMPTS
+        cache_key = None
+        if not kwargs.get("stream"):
+            cache_key = orjson.dumps([model, messages, kwargs], option=orjson.OPT_SORT_KEYS)
+            cached = self.completion_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        async for attempt in AsyncRetrying(
+            stop=stop_after_attempt(attempts),
+            wait=wait_random_exponential(multiplier=0.5, max=8),
+            retry=retry_if_exception_type(_RETRYABLE_ERRORS),
+            reraise=True
+        ):
+            with attempt:
+                # The client's own timeout should fire first; wait_for guarantees
+                # a hung socket can't pin the coroutine regardless
+                response = await asyncio.wait_for(
+                    self.client.chat.completions.create(
+                        messages=messages,
+                        model=model,
+                        timeout=timeout,
+                        **kwargs
+                    ),
+                    timeout=timeout + 1
+                )
+        if cache_key is not None:
+            self.completion_cache.set(cache_key, response)
+        return response
+
+    async def _within_timeout(self, coro: Awaitable[Any], default: Any, action: str) -> Any:
+        """Await coro within ENRICHMENT_TIMEOUT, returning default if it fails or times out."""
+        try:
+            return await asyncio.wait_for(coro, timeout=self.ENRICHMENT_TIMEOUT)
+        except TimeoutError:
+            logger.warning("Timed out %s", action)
+        except Exception:
+            logger.exception("Error %s", action)
+        return default
+
+    async def _cached_completion(
+        self,
+        namespace: str,
+        key_text: str,
+        coro_factory: Callable[[], Awaitable[Any]],
+        use_cache: bool = True
+    ) -> Any:
+        """
+        Return a cached LLM result for text semantically close to key_text,
+        otherwise await coro_factory() and cache its result.
+        """
+        if not use_cache:
+            return await coro_factory()
+
+        try:
+            response = await self.client.embeddings.create(
+                model="text-embedding-3-small",
+                input=key_text
+            )
+            vector = response.data[0].embedding
+        except Exception as e:
+            logger.exception("Error embedding cache key")
+            return await coro_factory()
+
+        cached = self.semantic_cache.get(namespace, vector)
+        if cached is not None:
+            return cached
+
+        result = await coro_factory()
+        if result:
+            self.semantic_cache.set(namespace, vector, result)
+        return result
+
     @property
     def current_year(self) -> int:
         """Get the current year."""
@@ -132,15 +636,7 @@ class UserQueryAgent(Agent):
         Returns:
             str: Current season (Winter, Spring, Summer, Fall)
         """
-        month = self.current_month
-        if month in [12, 1, 2]:
-            return "Winter"
-        elif month in [3, 4, 5]:
-            return "Spring"
-        elif month in [6, 7, 8]:
-            return "Summer"
-        else:
-            return "Fall"
+        return _MONTH_TO_SEASON[self.current_month - 1]
 
     def get_upcoming_season(self) -> str:
         """
@@ -149,116 +645,186 @@ class UserQueryAgent(Agent):
         Returns:
             str: Next season (Winter, Spring, Summer, Fall)
         """
-        current_season = self.get_current_season()
-        seasons = ["Winter", "Spring", "Summer", "Fall"]
-        current_idx = seasons.index(current_season)
-        return seasons[(current_idx + 1) % 4]
+        return _MONTH_TO_UPCOMING_SEASON[self.current_month - 1]
 
     async def get_product_category(self, focus_term: str) -> str:
         """Determine the product category using LLM."""
+        key = focus_term.strip().lower()
+        if key in self.CATEGORY_INDEX:
+            return self.CATEGORY_INDEX[key]
+        # Compound terms name their product last, e.g. "trail running shoes"
+        products = self.PRODUCT_REGEX.findall(key)
+        if products:
+            return self.CATEGORY_INDEX[products[-1]]
+
+        cached = self.category_cache.get(key)
+        if cached is not None:
+            return cached
+
         try:
-            prompt = f"""Return the product category for: "{focus_term}"
-            Return as JSON:
-            {{"category": "broad product category name"}}
-            
-            Example categories: clothing, footwear, electronics, home goods, beauty, etc.
-            Keep categories broad and standardized."""
-
-            response = await self.client.chat.completions.create(
-                messages=[{
-                    "role": "user", 
-                    "content": f"Return JSON: {prompt}"
-                }],
-                model="gpt-4-1106-preview",
-                response_format={"type": "json_object"},
-                temperature=0.3
+            prompt = _CATEGORY_PROMPT.format(focus_term=focus_term, categories=self.CATEGORY_NAMES)
+
+            response = await self._call_llm(
+                messages=[{"role": "user", "content": prompt}],
+                model=self.SMALL_MODEL,
+                response_format=_response_format(CategoryResult),
+                temperature=0.3,
+                max_tokens=self.CATEGORY_MAX_TOKENS,
+                # Enrichment waits on this lookup, so it shares that call's budget
+                timeout=self.ENRICHMENT_ATTEMPT_TIMEOUT,
+                attempts=self.ENRICHMENT_ATTEMPTS
             )
 
-            result = json.loads(response.choices[0].message.content)
-            return result.get("category", "general").lower()
+            result = CategoryResult.model_validate_json(response.choices[0].message.content)
+            category = result.category.lower()
+            self.category_cache.set(key, category)
+            return category
 
         except Exception as e:
-            print(f"Error getting product category: {str(e)}")
+            logger.exception("Error getting product category")
             return "general"
 
-    async def analyze_query_terms(self, query: str, attempt: int = 1, previous_focus: str = None) -> dict:
+    async def analyze_query_terms(self, query: str, attempt: int = 1, previous_focus: str = None, use_cache: bool = True) -> dict:
         """Analyze query terms to detect components and validate them."""
+        components, _ = await self._analyze_query(query, attempt, previous_focus, use_cache, QueryAnalysis)
+        return components
+
+    async def _analyze_query(
+        self,
+        query: str,
+        attempt: int,
+        previous_focus: Optional[str],
+        use_cache: bool,
+        schema: type[QueryAnalysis]
+    ) -> Tuple[dict, Optional[QueryAnalysis]]:
+        """
+        Analyze a query with the given analysis schema, returning the validated
+        components along with the raw analysis (None if the analysis failed).
+        
+        Successful results are memoized on the normalized query, so a repeat
+        query skips the embedding, analysis and validation calls entirely.
+        """
+        key = (schema.__name__, _normalize(query), attempt, previous_focus)
+        result = self.result_cache.get(key) if use_cache else None
+        if result is None:
+            result = await self._run_analysis(query, attempt, previous_focus, use_cache, schema)
+            if use_cache and result[0]:
+                self.result_cache.set(key, result)
+        components, analysis = result
+        # Callers may modify the components, so never hand out the cached dict
+        return copy.deepcopy(components), analysis
+
+    async def _run_analysis(
+        self,
+        query: str,
+        attempt: int,
+        previous_focus: Optional[str],
+        use_cache: bool,
+        schema: type[QueryAnalysis]
+    ) -> Tuple[dict, Optional[QueryAnalysis]]:
+        """Run the LLM analysis of a query and validate its components."""
         try:
             # If we have a previous focus and no clear focus in the current query,
             # prepend it to the query
-            if previous_focus and not any(term in query.lower() for term in ["shoes", "clothing", "apparel"]):
+            query_lower = query.lower()
+            if previous_focus and not self.PRODUCT_REGEX.search(query_lower):
                 query = f"{previous_focus} {query}"
+                query_lower = query.lower()
 
             # Step 1: Get initial analysis from LLM
-            prompt = f"""Analyze this market research query: "{query}"
-            Return a JSON object with these components:
-            {{
-                "focus_term": "product term (can be compound like 'running shoes' or 'winter boots')",
-                "objective": "single research objective (trends/demand/performance/comparison)",
-                "scope": "single analysis area (functionality/sustainability/technology/etc)",
-                "temporal_context": "single time reference",
-                "geographical_context": "single location reference",
-                "unmatched_terms": ["terms that don't fit any category"],
-                "original_keywords": {json.dumps(query.split())}
-            }}
-            
-            Important:
-            - Focus can be a compound term (e.g., 'running shoes', 'dress boots') but should not include scope modifiers
-            - Scope modifiers like 'sustainable', 'smart', 'eco-friendly' should be part of scope, not focus
-            - Objective must be one of: trends, demand, performance, comparison
-            - Scope must be one of: functionality, sustainability, technology, health, price, culture
-            - Only include terms that are explicitly mentioned in the query"""
-
-            response = await self.client.chat.completions.create(
-                messages=[{"role": "user", "content": prompt}],
-                model="gpt-4-1106-preview",
-                response_format={"type": "json_object"},
-                temperature=0.3
+            template = _PIPELINE_PROMPT if schema is QueryPipeline else _ANALYSIS_PROMPT
+            prompt = template.format(query=query, categories=self.CATEGORY_NAMES)
+
+            # Validators are started from the stream as soon as their field is
+            # complete, overlapping them with the rest of the analysis
+            checks: Dict[str, Tuple[str, asyncio.Task]] = {}
+            validators = {"objective": self.validate_objective, "scope": self.validate_scope}
+
+            async def _analyze() -> QueryAnalysis:
+                stream = await self._call_llm(
+                    messages=[{"role": "user", "content": prompt}],
+                    model=self.LARGE_MODEL,
+                    response_format=_response_format(schema),
+                    temperature=0.3,
+                    stream=True
+                )
+                scanner = _JsonFieldScanner()
+                content = []
+                async for chunk in stream:
+                    if chunk.choices and (text := chunk.choices[0].delta.content):
+                        content.append(text)
+                        for key, value in scanner.feed(text):
+                            if key in validators and (value := _text(value)):
+                                checks[key] = (value, asyncio.create_task(validators[key](value)))
+                return schema.model_validate_json("".join(content))
+
+            # Only the LLM analysis is cached; temporal and location context are
+            # still matched against this exact query below. A semantic hit replays
+            # the focus, objective and scope too, so queries naming different
+            # products or cueing different objectives and scopes are kept in
+            # separate namespaces and never match each other. Each product is
+            # keyed with the word before it, which tells e.g. "running shoes"
+            # from "hiking shoes"
+            products = ",".join(
+                " ".join([*query_lower[:match.start()].split()[-1:], match.group()])
+                for match in self.PRODUCT_REGEX.finditer(query_lower)
+            )
+            cues = ",".join(label for label, pattern in self.ANALYSIS_CUE_PATTERNS if pattern.search(query_lower))
+            analysis = await self._cached_completion(
+                f"{schema.__name__}:{products}:{cues}", query, _analyze, use_cache
             )
-            
-            analysis = json.loads(response.choices[0].message.content)
             components = {}
             
             # Step 2: Extract and validate components
-            if focus := analysis.get("focus_term"):
+            if focus := _text(analysis.focus_term):
                 components["focus_term"] = focus.lower()
+                # The category comes back with the analysis, so prime the cache
+                # and spare enrichment a separate get_product_category round-trip
+                if category := _text(analysis.category):
+                    components["category"] = category.lower()
+                    self.category_cache.set(components["focus_term"], components["category"])
             
-            if objective := analysis.get("objective"):
-                if await self.validate_objective(objective):
-                    components["objective"] = objective.lower()
-            
-            # Extract temporal context using patterns
-            temporal_matches = []
-            for pattern_type, pattern in self.TEMPORAL_PATTERNS.items():
-                matches = re.finditer(pattern, query.lower(), re.IGNORECASE)
-                for match in matches:
-                    temporal_matches.append({
-                        'type': pattern_type,
-                        'value': match.group()
-                    })
+            # Start any validation the stream didn't (e.g. on a cache hit) before
+            # awaiting either, so both run concurrently
+            def _check(field: str, value: Optional[str]) -> Optional[asyncio.Task]:
+                if not value:
+                    return None
+                if field in checks and checks[field][0] == value:
+                    return checks[field][1]
+                return asyncio.create_task(validators[field](value))
+
+            objective = _text(analysis.objective)
+            scope = _text(analysis.scope)
+            objective_check = _check("objective", objective)
+            scope_check = _check("scope", scope)
+
+            if objective_check and (await objective_check)[0]:
+                components["objective"] = objective.lower()
             
-            # Sort matches by length to prioritize longer matches like "next season"
-            temporal_matches.sort(key=lambda x: len(x['value']), reverse=True)
+            # Extract temporal and location context in one pass over the query
+            matches = {"temporal": [], "location": []}
+            for match in self.CONTEXT_REGEX.finditer(query_lower):
+                kind, _, pattern_type = match.lastgroup.partition("_")
+                matches[kind].append({
+                    'type': pattern_type,
+                    'value': match.group(),
+                    'rank': self.CONTEXT_REGEX.groupindex[match.lastgroup]
+                })
+            temporal_matches = matches["temporal"]
+            location_matches = matches["location"]
 
+            # Prefer longer matches like "next season", then earlier pattern types.
+            # Only the best match is used, so a linear scan replaces sorting
             if temporal_matches:
-                components["temporal_context"] = temporal_matches[0]['value']
-            
-            # Extract location context using patterns
-            location_matches = []
-            for pattern_type, pattern in self.LOCATION_PATTERNS.items():
-                matches = re.finditer(pattern, query.lower(), re.IGNORECASE)
-                for match in matches:
-                    location_matches.append({
-                        'type': pattern_type,
-                        'value': match.group()
-                    })
+                best = min(temporal_matches, key=lambda x: (-len(x['value']), x['rank']))
+                components["temporal_context"] = best['value']
             
             if location_matches:
-                components["geographical_context"] = location_matches[0]['value']
+                best = min(location_matches, key=lambda x: x['rank'])
+                components["geographical_context"] = best['value']
             
-            if scope := analysis.get("scope"):
-                if await self.validate_scope(scope):
-                    components["scope"] = scope.lower()
+            if scope_check and (await scope_check)[0]:
+                components["scope"] = scope.lower()
             
             # Step 3: Check for missing components on first attempt
             if attempt == 1:
@@ -275,13 +841,13 @@ class UserQueryAgent(Agent):
                 if "geographical_context" not in components:
                     missing.append("location reference (e.g., global, Europe)")
                 
-                if missing or analysis.get("unmatched_terms"):
+                if missing or analysis.unmatched_terms:
                     components["validation"] = {
-                        "unmatched_terms": analysis.get("unmatched_terms", []),
+                        "unmatched_terms": analysis.unmatched_terms,
                         "missing_components": missing,
                         "attempt": attempt
                     }
-                    return components
+                    return components, analysis
             
             # Step 4: Add defaults only after second attempt
             if attempt > 1:
@@ -293,14 +859,41 @@ class UserQueryAgent(Agent):
                     components["temporal_context"] = "current"
                 # Removed default scope assignment
 
-            return components
+            return components, analysis
 
         except Exception as e:
-            print(f"Error analyzing query terms: {str(e)}")
-            return {}
+            logger.exception("Error analyzing query terms")
+            return {}, None
 
-    async def enrich_query_data(self, query_components: dict) -> dict:
-        """Enrich query data with additional relevant terms."""
+    async def enrich_query_data(self, query_components: dict, enrichment: Optional[QueryEnrichment] = None) -> dict:
+        """
+        Enrich query data with additional relevant terms.
+        
+        Args:
+            query_components: Output of analyze_query_terms
+            enrichment: Related terms already generated for these components,
+                e.g. by full_pipeline, in which case no enrichment call is made
+        """
+        if enrichment is not None:
+            return await self._enrich_query_data(query_components, enrichment)
+
+        # Memoize on the components themselves, so repeat queries that analyze
+        # to the same components skip the enrichment round-trip
+        try:
+            key = ("enrichment", orjson.dumps(query_components, option=orjson.OPT_SORT_KEYS))
+        except TypeError:
+            return await self._enrich_query_data(query_components)
+        cached = self.result_cache.get(key)
+        if cached is not None:
+            return copy.deepcopy(cached)
+        enriched = await self._enrich_query_data(query_components)
+        if enriched:
+            # The result shares the caller's components dict, so cache a copy
+            self.result_cache.set(key, copy.deepcopy(enriched))
+        return enriched
+
+    async def _enrich_query_data(self, query_components: dict, enrichment: Optional[QueryEnrichment] = None) -> dict:
+        """Build the enriched query data, generating related terms unless given."""
         if not query_components or not query_components.get("focus_term"):
             return None
 
@@ -311,14 +904,12 @@ class UserQueryAgent(Agent):
             location = query_components.get("geographical_context", "global")
             scope = query_components.get("scope")
 
-            # Get product category for better enrichment
-            category = await self.get_product_category(focus)
-            
             # Prepare location metadata based on context
             location_terms = []
-            if location.lower() == "global":
+            location_lower = location.lower()
+            if location_lower == "global":
                 location_terms = ["Europe", "North America", "Asia"]
-            elif location.lower() in ["europe", "asia", "africa", "north america", "south america", "australia"]:
+            elif location_lower in CONTINENTS:
                 location_terms = [location]
             
             # Prepare temporal context
@@ -326,18 +917,16 @@ class UserQueryAgent(Agent):
             temporal_metadata = {}
             
             if isinstance(temporal, str):
-                current_year = str(self.current_year)
+                # One clock read for the whole call
+                now = datetime.now()
+                current_year = str(now.year)
+                current_season = _MONTH_TO_SEASON[now.month - 1]
                 
                 if 'next season' in temporal.lower():
-                    next_season = self.get_upcoming_season()
-                    next_season_month = {
-                        "Spring": "March",
-                        "Summer": "June",
-                        "Fall": "September",
-                        "Winter": "December"
-                    }[next_season]
+                    next_season = _NEXT_SEASON[current_season]
+                    next_season_month = _SEASON_MONTH[next_season]
                     
-                    next_year = str(self.current_year + 1)
+                    next_year = str(now.year + 1)
                     temporal_terms = [
                         f"{next_season} {next_year}",
                         f"{next_season_month} {next_year}"
@@ -345,20 +934,8 @@ class UserQueryAgent(Agent):
                     temporal_metadata["duration"] = "12 months"
                 
                 elif 'past season' in temporal.lower():
-                    current_season = self.get_current_season()
-                    past_season_map = {
-                        "Spring": "Winter",
-                        "Summer": "Spring",
-                        "Fall": "Summer",
-                        "Winter": "Fall"
-                    }
-                    past_season = past_season_map[current_season]
-                    past_season_month = {
-                        "Spring": "March",
-                        "Summer": "June",
-                        "Fall": "September",
-                        "Winter": "December"
-                    }[past_season]
+                    past_season = _PREVIOUS_SEASON[current_season]
+                    past_season_month = _SEASON_MONTH[past_season]
                     
                     temporal_terms = [
                         f"{past_season} {current_year}",
@@ -370,6 +947,35 @@ class UserQueryAgent(Agent):
                     temporal_terms = [temporal]
                     temporal_metadata["duration"] = "12 months"  # fixed duration for all cases
             
+            # Prepare enrichment prompt
+            prompt = _ENRICHMENT_PROMPT.format(focus=focus, objective=objective, scope=scope or "none")
+
+            async def _enrich() -> QueryEnrichment:
+                response = await self._call_llm(
+                    messages=[{"role": "user", "content": prompt}],
+                    model=self.SMALL_MODEL,
+                    response_format=_response_format(QueryEnrichment),
+                    temperature=0.7,
+                    timeout=self.ENRICHMENT_ATTEMPT_TIMEOUT,
+                    attempts=self.ENRICHMENT_ATTEMPTS
+                )
+                return QueryEnrichment.model_validate_json(response.choices[0].message.content)
+
+            # The category lookup and the enrichment call are independent, so run
+            # both round-trips concurrently. Each falls back to an empty default
+            # on failure or timeout, so one slow call can't sink the whole result
+            async with asyncio.TaskGroup() as group:
+                category_task = group.create_task(self._within_timeout(
+                    self.get_product_category(focus), "general", "looking up product category"
+                ))
+                if enrichment is None:
+                    enrich_task = group.create_task(self._within_timeout(
+                        _enrich(), QueryEnrichment(objective=[], focus=[], scope=[]), "enriching query terms"
+                    ))
+            category = category_task.result()
+            if enrichment is None:
+                enrichment = enrich_task.result()
+
             # Add temporal metadata to the metadata dict
             metadata = {
                 "location_terms": location_terms,
@@ -378,26 +984,13 @@ class UserQueryAgent(Agent):
                 "category": category
             }
 
-            # Prepare enrichment prompt
-            prompt = f"""Given a focus on {focus} with objective {objective}, provide JSON with:
-            {{
-                "objective": ["1 synonym for {objective}"],
-                "focus": ["2-3 related terms for {focus}"],
-                "scope": ["up to 5 relevant terms about {scope}" if scope else "[]"],
-                "location": {json.dumps(location_terms)},
-                "temporal": {json.dumps(temporal_terms)}
-            }}
-            Keep terms concise and directly relevant to the current context.
-            For temporal terms, use only specific time references matching the original context."""
-
-            response = await self.client.chat.completions.create(
-                messages=[{"role": "user", "content": prompt}],
-                model="gpt-4-1106-preview",
-                response_format={"type": "json_object"},
-                temperature=0.7
-            )
-
-            enriched = json.loads(response.choices[0].message.content)
+            enriched = enrichment.model_dump()
+            # Drop blank terms in a single pass per list
+            for field in ("objective", "focus", "scope"):
+                enriched[field] = [term for term in map(_text, enriched[field]) if term]
+            # Location and temporal terms are already resolved above
+            enriched["location"] = location_terms
+            enriched["temporal"] = temporal_terms
             
             # Add objective synonyms - limit to 1
             if objective.lower() in self.OBJECTIVE_TERMS:
@@ -410,9 +1003,64 @@ class UserQueryAgent(Agent):
             }
 
         except Exception as e:
-            print(f"Error enriching query: {str(e)}")
+            logger.exception("Error enriching query")
             return None
 
+    def build_keyword_queries(self, enriched_data: dict) -> List[Dict[str, Any]]:
+        """Build keyword queries from enriched data, most specific first."""
+        original = enriched_data.get("original", {})
+        metadata = enriched_data.get("metadata", {})
+        
+        # Get components with defaults
+        focus = original.get("focus_term", "")
+        objective = original.get("objective", "trends")
+        geo_context = original.get("geographical_context", "global")
+        temporal = metadata.get("temporal", {})
+        scope = original.get("scope", "")
+        temporal_terms = metadata.get("temporal_terms", [])
+        
+        # All queries share one metadata dict
+        query_metadata = {
+            "location": metadata.get("location_terms", []),
+            "category": metadata.get("category"),
+            "temporal": temporal
+        }
+        
+        has_location = bool(geo_context) and geo_context.lower() != "global"
+        temporal_term = temporal_terms[0] if temporal_terms and temporal_terms[0] else None
+        
+        # Query variants in order of specificity: all components, the general
+        # category, then one per location, temporal and scope component
+        variants = (
+            [focus, objective, geo_context if has_location else None, temporal_term, scope],
+            [focus, objective],
+            [focus, objective, geo_context] if has_location else None,
+            [focus, objective, temporal_term] if temporal_term else None,
+            [focus, objective, scope] if scope else None
+        )
+        # dict.fromkeys drops duplicate queries while keeping their order
+        query_strings = dict.fromkeys(
+            " ".join(part for part in parts if part).strip()
+            for parts in variants if parts
+        )
+        keyword_queries = [{"query": query, "metadata": query_metadata} for query in query_strings]
+        return keyword_queries
+
+    def _semantic_queries_prompt(self, enriched_data: dict) -> str:
+        """Build the prompt asking the LLM for natural language research questions."""
+        original = enriched_data.get("original", {})
+        enriched = enriched_data.get("enriched", {})
+        metadata = enriched_data.get("metadata", {})
+
+        return _SEMANTIC_QUERIES_PROMPT.format(
+            focus=original["focus_term"],
+            objective=original.get("objective"),
+            objective_terms=", ".join(enriched.get("objective", [])),
+            temporal=metadata.get("temporal", "current"),
+            location=original.get("geographical_context", "global"),
+            scope=", ".join(enriched.get("scope", [])) if enriched.get("scope", []) else "general"
+        )
+
     async def generate_search_queries(self, enriched_data: dict) -> dict:
         """Generate search queries from enriched data."""
         if not enriched_data:
@@ -421,145 +1069,107 @@ class UserQueryAgent(Agent):
         queries = {"keyword_queries": [], "semantic_queries": []}
         
         try:
-            # Extract components
-            original = enriched_data.get("original", {})
-            enriched = enriched_data.get("enriched", {})
-            metadata = enriched_data.get("metadata", {})
-            
-            # Get components with defaults
-            focus = original.get("focus_term", "")
-            objective = original.get("objective", "trends")
-            geo_context = original.get("geographical_context", "global")
-            temporal = metadata.get("temporal", {})
-            scope = original.get("scope", "")
-            temporal_terms = metadata.get("temporal_terms", [])
-            
-            # Generate queries in order of specificity
-            queries["keyword_queries"] = []
-            
-            # 1. Most specific query (all components)
-            query_parts = []
-            query_parts.append(focus)
-            query_parts.append(objective)
-            if geo_context and geo_context.lower() != "global":
-                query_parts.append(geo_context)
-            if temporal_terms and temporal_terms[0]:
-                query_parts.append(temporal_terms[0])
-            if scope:
-                query_parts.append(scope)
-            queries["keyword_queries"].append({
-                "query": " ".join(query_parts).strip(),
-                "metadata": {
-                    "location": metadata.get("location_terms", []),
-                    "category": metadata.get("category"),
-                    "temporal": temporal
-                }
-            })
-            
-            # 2. General category query
-            base_query = f"{focus} {objective}"
-            if base_query != queries["keyword_queries"][0]["query"]:
-                queries["keyword_queries"].append({
-                    "query": base_query,
-                    "metadata": {
-                        "location": metadata.get("location_terms", []),
-                        "category": metadata.get("category"),
-                        "temporal": temporal
-                    }
-                })
-            
-            # 3. Location-specific query (if applicable)
-            if geo_context and geo_context.lower() != "global":
-                location_query = f"{focus} {objective} {geo_context}"
-                queries["keyword_queries"].append({
-                    "query": location_query,
-                    "metadata": {
-                        "location": metadata.get("location_terms", []),
-                        "category": metadata.get("category"),
-                        "temporal": temporal
-                    }
-                })
-            
-            # 4. Temporal-specific query
-            if temporal_terms and temporal_terms[0]:
-                temporal_query = f"{focus} {objective} {temporal_terms[0]}"
-                queries["keyword_queries"].append({
-                    "query": temporal_query,
-                    "metadata": {
-                        "location": metadata.get("location_terms", []),
-                        "category": metadata.get("category"),
-                        "temporal": temporal
-                    }
-                })
-            
-            # 5. Scope-specific query
-            if scope:
-                scope_query = f"{focus} {objective} {scope}"
-                queries["keyword_queries"].append({
-                    "query": scope_query,
-                    "metadata": {
-                        "location": metadata.get("location_terms", []),
-                        "category": metadata.get("category"),
-                        "temporal": temporal
-                    }
-                })
-            
+            queries["keyword_queries"] = self.build_keyword_queries(enriched_data)
+
             # Generate natural language semantic queries
-            prompt = f"""Generate 5 research questions about {original["focus_term"]}.
-
-            Use these components:
-            - Objective: {original.get("objective")} ({", ".join(enriched.get("objective", []))})
-            - Time frame: {metadata.get("temporal", "current")}
-            - Location: {original.get("geographical_context", "global")}
-            - Scope: {", ".join(enriched.get("scope", [])) if enriched.get("scope", []) else "general"}
-
-            Guidelines:
-            1. First question should be very close to the original query
-            2. Other questions should explore different perspectives
-            3. Keep questions general and high-level
-            4. Avoid too specific or technical details
-            5. Make questions simple and direct
-
-            Return a JSON object with an array of 5 queries in the format:
-            {{
-                "queries": [
-                    "What are the [objective] for [product] in [location]?",
-                    "How is the market evolving?",
-                    "What are the main influencing factors?",
-                    "What direction is this heading?",
-                    "Why do people make these choices?"
-                ]
-            }}"""
-
-            response = await self.client.chat.completions.create(
-                messages=[{"role": "user", "content": prompt}],
-                model="gpt-4-1106-preview",
-                response_format={"type": "json_object"},
+            response = await self._call_llm(
+                messages=[{"role": "user", "content": self._semantic_queries_prompt(enriched_data)}],
+                model=self.LARGE_MODEL,
+                response_format=_response_format(SemanticQueries),
                 temperature=0.7
             )
 
-            semantic_queries = json.loads(response.choices[0].message.content)
-            queries["semantic_queries"] = semantic_queries.get("queries", [])
+            semantic_queries = SemanticQueries.model_validate_json(response.choices[0].message.content)
+            queries["semantic_queries"] = semantic_queries.queries
             
             return queries
             
         except Exception as e:
-            print(f"Error generating search queries: {str(e)}")
+            logger.exception("Error generating search queries")
             return {"keyword_queries": [], "semantic_queries": []}
 
+    async def stream_search_queries(
+        self,
+        enriched_data: dict,
+        include_keywords: bool = True
+    ) -> AsyncIterator[str]:
+        """
+        Yield search queries as soon as each one is available.
+        
+        Keyword queries are built locally and yielded first; semantic queries are
+        streamed from the LLM and yielded one by one as the model completes them,
+        so downstream searches can start before generation finishes.
+        
+        Args:
+            enriched_data: Output of enrich_query_data
+            include_keywords: Whether to yield the keyword queries; pass False
+                to stream only the semantic queries
+        
+        Raises:
+            Exception: Whatever failed while generating the queries, after the
+                queries already yielded, so callers can report the failure
+        """
+        if not enriched_data:
+            return
+
+        try:
+            if include_keywords:
+                for keyword_query in self.build_keyword_queries(enriched_data):
+                    yield keyword_query["query"]
+
+            stream = await self._call_llm(
+                messages=[{"role": "user", "content": self._semantic_queries_prompt(enriched_data)}],
+                model=self.LARGE_MODEL,
+                response_format=_response_format(SemanticQueries),
+                temperature=0.7,
+                stream=True
+            )
+            scanner = _JsonStringArrayScanner()
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    for semantic_query in scanner.feed(chunk.choices[0].delta.content):
+                        yield semantic_query
+
+        except Exception:
+            logger.exception("Error streaming search queries")
+            raise
+
     def is_seasonal_category(self, category: str) -> bool:
         """Check if the product category is seasonal."""
-        seasonal_categories = {
-            "clothing", "footwear", "accessories", "sports equipment",
-            "outdoor gear", "swimwear", "beachwear"
-        }
-        return category.lower() in seasonal_categories
+        return category.lower() in SEASONAL_CATEGORIES
+
+    async def full_pipeline(
+        self,
+        query: str,
+        attempt: int = 1,
+        previous_focus: str = None,
+        use_cache: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Analyze, categorize and enrich a query with a single LLM request.
+        
+        Equivalent to analyze_query_terms followed by enrich_query_data, but the
+        analysis, category and related terms come back in one response instead
+        of three round-trips. Context matching and validation still run locally.
+        
+        Returns:
+            dict: "components" as returned by analyze_query_terms, and "enriched"
+            as returned by enrich_query_data, or None while components are
+            missing on a first attempt
+        """
+        components, analysis = await self._analyze_query(
+            query, attempt, previous_focus, use_cache, QueryPipeline
+        )
+        enriched = None
+        if components and not components.get("validation"):
+            enriched = await self.enrich_query_data(components, analysis.enrichment)
+        return {"components": components, "enriched": enriched}
 
     async def extract_structured_components(self, query: str, use_cache: bool = True) -> Dict[str, Any]:
         """Extract structured components from the query."""
         try:
             # Use the analysis result directly
-            result = await self.analyze_query_terms(query)
+            result = await self.analyze_query_terms(query, use_cache=use_cache)
             if not result:
                 return None
             
@@ -585,9 +1195,49 @@ class UserQueryAgent(Agent):
             }
 
         except Exception as e:
-            print(f"Error extracting components: {e}")
+            logger.exception("Error extracting components")
             return None
 
+    async def process_queries(self, queries: List[str], max_concurrency: int = 20) -> List[Any]:
+        """
+        Run the analyze, enrich and generate chain for several queries concurrently.
+        
+        Args:
+            queries: User queries to process
+            max_concurrency: Maximum number of queries in flight at once, which
+                keeps the shared connection pool from being overwhelmed
+            
+        Returns:
+            One entry per query, in order: the processed result, or the
+            exception raised for that query
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        return await asyncio.gather(
+            *(self._process_one(query, semaphore) for query in queries),
+            return_exceptions=True
+        )
+
+    async def _process_one(self, query: str, semaphore: asyncio.Semaphore) -> Dict[str, Any]:
+        """Process a single query under the batch semaphore."""
+        async with semaphore:
+            result = await self.full_pipeline(query)
+            if result["components"].get("validation"):
+                # No user to ask for the missing parts in a batch, so fall back
+                # to the defaults of a second attempt
+                result = await self.full_pipeline(query, attempt=2)
+            components = result["components"]
+            if not components:
+                return {}
+
+            enriched = result["enriched"]
+            search_queries = await self.generate_search_queries(enriched)
+            return {
+                "query": query,
+                "components": components,
+                "enriched": enriched,
+                "search_queries": search_queries
+            }
+
     def get_scope_terms(self) -> dict:
         """Return predefined scope terms for different categories."""
         return {
@@ -606,20 +1256,21 @@ class UserQueryAgent(Agent):
     async def validate_objective(self, objective: str) -> tuple[bool, str]:
         """Validate if the objective is relevant for market research."""
         try:
-            prompt = f"""Is this objective "{objective}" relevant for customer research?
-            Valid objectives include: trends, comparison, performance, analysis, demand, preferences, etc.
-            Return JSON: {{"is_valid": boolean, "suggestion": "suggested correction if invalid, empty if valid"}}"""
+            # Normalized so case and spacing variants hit the same cached completion
+            prompt = _VALIDATE_OBJECTIVE_PROMPT.format(objective=_normalize(objective))
 
-            response = await self.client.chat.completions.create(
+            response = await self._call_llm(
                 messages=[{"role": "user", "content": prompt}],
-                model="gpt-4-1106-preview",
-                response_format={"type": "json_object"},
-                temperature=0.3
+                model=self.SMALL_MODEL,
+                response_format=_response_format(ValidationResult),
+                temperature=0.3,
+                max_tokens=self.VALIDATION_MAX_TOKENS,
+                timeout=self.FAST_LLM_TIMEOUT
             )
-            result = json.loads(response.choices[0].message.content)
-            return result["is_valid"], result.get("suggestion", "")
+            result = ValidationResult.model_validate_json(response.choices[0].message.content)
+            return result.is_valid, result.suggestion
         except Exception as e:
-            print(f"Error validating objective: {str(e)}")
+            logger.exception("Error validating objective")
             return True, ""
 
     async def validate_temporal(self, temporal: str) -> tuple[bool, str]:
@@ -652,37 +1303,37 @@ class UserQueryAgent(Agent):
     async def validate_geographical(self, geo_context: str) -> tuple[bool, str]:
         """Validate if the geographical context is valid."""
         try:
-            prompt = f"""Is this geographical context "{geo_context}" valid for customer research?
-            Valid formats: global, continent names, country names, regions, major cities, etc.
-            Return JSON: {{"is_valid": boolean, "suggestion": "suggested correction if invalid, empty if valid"}}"""
+            prompt = _VALIDATE_GEOGRAPHICAL_PROMPT.format(geo_context=_normalize(geo_context))
 
-            response = await self.client.chat.completions.create(
+            response = await self._call_llm(
                 messages=[{"role": "user", "content": prompt}],
-                model="gpt-4-1106-preview",
-                response_format={"type": "json_object"},
-                temperature=0.3
+                model=self.SMALL_MODEL,
+                response_format=_response_format(ValidationResult),
+                temperature=0.3,
+                max_tokens=self.VALIDATION_MAX_TOKENS,
+                timeout=self.FAST_LLM_TIMEOUT
             )
-            result = json.loads(response.choices[0].message.content)
-            return result["is_valid"], result.get("suggestion", "")
+            result = ValidationResult.model_validate_json(response.choices[0].message.content)
+            return result.is_valid, result.suggestion
         except Exception as e:
-            print(f"Error validating geographical context: {str(e)}")
+            logger.exception("Error validating geographical context")
             return True, ""
 
     async def validate_scope(self, scope: str) -> tuple[bool, str]:
         """Validate if the scope/analysis areas are relevant."""
         try:
-            prompt = f"""Is this scope/analysis area "{scope}" relevant for customer research?
-            Valid areas include: functionality, sustainability, technology, design, price, quality, etc.
-            Return JSON: {{"is_valid": boolean, "suggestion": "suggested correction if invalid, empty if valid"}}"""
+            prompt = _VALIDATE_SCOPE_PROMPT.format(scope=_normalize(scope))
 
-            response = await self.client.chat.completions.create(
+            response = await self._call_llm(
                 messages=[{"role": "user", "content": prompt}],
-                model="gpt-4-1106-preview",
-                response_format={"type": "json_object"},
-                temperature=0.3
+                model=self.SMALL_MODEL,
+                response_format=_response_format(ValidationResult),
+                temperature=0.3,
+                max_tokens=self.VALIDATION_MAX_TOKENS,
+                timeout=self.FAST_LLM_TIMEOUT
             )
-            result = json.loads(response.choices[0].message.content)
-            return result["is_valid"], result.get("suggestion", "")
+            result = ValidationResult.model_validate_json(response.choices[0].message.content)
+            return result.is_valid, result.suggestion
         except Exception as e:
-            print(f"Error validating scope: {str(e)}")
+            logger.exception("Error validating scope")
             return True, ""
\ No newline at end of file
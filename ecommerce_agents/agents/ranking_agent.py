@@ -2,12 +2,63 @@
 Pre-Ranking Agent for evaluating and ranking search results.
 """
 from typing import Dict, List, Optional
-from datetime import datetime
-import json
+from datetime import datetime, timezone
+from functools import lru_cache
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+import heapq
+import math
+import numpy as np
 from phi.agent import Agent
 from phi.llm.openai import OpenAIChat
 
 
+# Query parameters that only track the visit and never change the page
+_TRACKING_PARAMS = frozenset({"gclid", "fbclid", "msclkid"})
+
+
+def _canonical_url(url: str) -> str:
+    """
+    Canonical form of a URL for deduplication: lowercased scheme and host, no
+    fragment, tracking parameters or trailing slash.
+    """
+    try:
+        parts = urlsplit(url.strip())
+    except ValueError:
+        return url
+    query = urlencode([
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in _TRACKING_PARAMS
+    ])
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip("/"), query, ""))
+
+
+@lru_cache(maxsize=1024)
+def _parse_date(date: str) -> Optional[datetime]:
+    """
+    Parse an ISO date as an aware datetime, or None if it can't be parsed.
+    
+    Dates without a timezone are taken as UTC. Cached because search results
+    often share the same timestamps.
+    """
+    if date.endswith("Z"):
+        date = date[:-1] + "+00:00"
+    try:
+        parsed = datetime.fromisoformat(date)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def _days_old(date: Optional[str], now: datetime) -> float:
+    """Age of an ISO date in days, or NaN if it is missing or can't be parsed."""
+    parsed = _parse_date(date) if isinstance(date, str) and date else None
+    if parsed is None:
+        return math.nan
+    return (now - parsed).days
+
+
 class PreRankingAgent(Agent):
     def __init__(
         self,
@@ -62,31 +113,23 @@ Example output format:
                 search_results.get("search_results", {}).get("exa", [])
             )
             
-            # Remove duplicates
-            seen_urls = set()
-            unique_results = []
-            duplicates = 0
-            
+            # Remove duplicates and results without a URL, keeping the first
+            # result for each canonical URL
+            unique_by_url = {}
             for result in all_results:
-                url = result.get("url")
-                if url and url not in seen_urls:
-                    seen_urls.add(url)
-                    unique_results.append(result)
-                else:
-                    duplicates += 1
-            
-            # Score and rank results
-            ranked_results = []
-            for result in unique_results:
-                score = self._calculate_score(result)
-                ranked_results.append({
-                    **result,
-                    "score": score
-                })
+                if result.get("url"):
+                    unique_by_url.setdefault(_canonical_url(result["url"]), result)
+            unique_results = list(unique_by_url.values())
+            duplicates = len(all_results) - len(unique_results)
             
-            # Sort by score and take top 7
-            ranked_results.sort(key=lambda x: x["score"], reverse=True)
-            top_results = ranked_results[:7]
+            # Score all results at once, then select the top 7 without sorting
+            # them all. nlargest keeps tied results in their original order
+            scores = self._calculate_scores(unique_results, datetime.now(timezone.utc)).tolist()
+            top_indices = heapq.nlargest(7, range(len(scores)), key=scores.__getitem__)
+            top_results = [
+                {**unique_results[i], "score": scores[i]}
+                for i in top_indices
+            ]
             
             return {
                 "ranked_results": top_results,
@@ -103,27 +146,17 @@ Example output format:
                 "results": search_results
             }
     
-    def _calculate_score(self, result: Dict) -> float:
-        """Calculate a score for a single result."""
-        base_score = 0.0
-        
-        # Base score from Exa (if available)
-        if "score" in result:
-            base_score += result["score"] * 0.4
+    def _calculate_scores(self, results: List[Dict], now: datetime) -> np.ndarray:
+        """Calculate the scores of all results as one array, with freshness relative to now (UTC)."""
+        # Base score from Exa and highlight score (if available)
+        base_scores = np.array([result.get("score", 0.0) for result in results], dtype=float)
+        highlight_scores = np.array([result.get("highlight_score", 0.0) for result in results], dtype=float)
         
-        # Highlight score (if available)
-        if "highlight_score" in result:
-            base_score += result["highlight_score"] * 0.3
+        # Freshness boost, decaying over a year; no boost for unknown dates
+        days_old = np.array([_days_old(result.get("date"), now) for result in results], dtype=float)
+        freshness_scores = np.nan_to_num(np.maximum(0, 1 - days_old / 365), nan=0.0)
         
-        # Freshness boost
-        if "date" in result and result["date"]:
-            try:
-                date = datetime.fromisoformat(result["date"].replace("Z", "+00:00"))
-                days_old = (datetime.now() - date).days
-                freshness_score = max(0, 1 - (days_old / 365))  # Decay over a year
-                base_score += freshness_score * 0.3
-            except (ValueError, TypeError):
-                pass
+        scores = base_scores * 0.4 + highlight_scores * 0.3 + freshness_scores * 0.3
         
-        # Ensure score is between 0 and 100
-        return min(100, max(0, base_score * 100))
+        # Ensure scores are between 0 and 100
+        return np.clip(scores * 100, 0, 100)
@@ -1,12 +1,18 @@
 """
 Scraping Agent for extracting content from ranked URLs.
 """
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
-import json
+import re
 from phi.agent import Agent
 from phi.llm.openai import OpenAIChat
 from ..tools import FirecrawlTool
+from ..utils.cache import PersistentCache
+
+# Alt text of decorative images that don't illustrate the content
+_DECORATIVE_ALT = re.compile(r"icon|logo|sprite|avatar", re.IGNORECASE)
+# Text content types treated as key points
+_KEY_POINT_TYPES = frozenset({"h1", "h2", "h3"})
 
 
 class ScrapingAgent(Agent):
@@ -26,6 +32,8 @@ class ScrapingAgent(Agent):
         
         # Initialize tools
         self.firecrawl_tool = FirecrawlTool()
+        # Scraped pages, kept across sessions since runs often revisit the same URLs
+        self.scrape_cache = PersistentCache("tmp/scrape_cache.db", ttl=6 * 60 * 60)
         
         # Set the system message
         self.system_message = """You are a specialized scraping agent that extracts and processes content from ranked URLs.
@@ -68,16 +76,25 @@ Example output format:
     }
 }"""
 
-    def scrape_urls(self, ranked_results: Dict, save_path: Optional[str] = None) -> Dict:
-        """Scrape content from ranked URLs."""
+    async def scrape_urls(self, ranked_results: Dict, save_path: Optional[str] = None, use_cache: bool = True) -> Dict:
+        """
+        Scrape content from ranked URLs, fetching the pages concurrently.
+        
+        Args:
+            ranked_results: Output of PreRankingAgent.rank_results
+            save_path: Optional path to save scraped content as JSON
+            use_cache: Serve pages scraped in the last 6 hours from the cache;
+                disable for freshness-critical runs
+        """
         try:
             # Extract URLs from ranked results
             urls = [result["url"] for result in ranked_results.get("ranked_results", [])]
             
             # Use Firecrawl to scrape content
-            scraped_content = self.firecrawl_tool.run(
+            scraped_content = await self.firecrawl_tool._arun(
                 urls=urls,
-                save_path=save_path
+                save_path=save_path,
+                cache=self.scrape_cache if use_cache else None
             )
             
             # Count successes and failures
@@ -108,11 +125,12 @@ Example output format:
             for item in scraped_data.get("scraped_content", []):
                 if item.get("status") == "success":
                     # Extract main content sections
+                    main_text, key_points = self._split_text_content(item["text_content"])
                     content = {
                         "url": item["url"],
                         "title": item["title"],
-                        "main_text": self._extract_main_text(item["text_content"]),
-                        "key_points": self._extract_key_points(item["text_content"]),
+                        "main_text": main_text,
+                        "key_points": key_points,
                         "images": self._filter_relevant_images(item["images"])
                     }
                     processed_content.append(content)
@@ -131,27 +149,20 @@ Example output format:
                 "data": scraped_data
             }
     
-    def _extract_main_text(self, text_content: List[Dict]) -> str:
-        """Extract and combine main text content."""
-        main_text = []
-        for item in text_content:
-            if item["type"] == "p":
-                main_text.append(item["content"])
-        return "\n\n".join(main_text)
-    
-    def _extract_key_points(self, text_content: List[Dict]) -> List[str]:
-        """Extract key points from content."""
+    def _split_text_content(self, text_content: List[Dict]) -> Tuple[str, List[str]]:
+        """Split text content in one pass into the combined main text and the key points (headings)."""
+        paragraphs = []
         key_points = []
         for item in text_content:
-            if item["type"] in ["h1", "h2", "h3"]:
+            item_type = item["type"]
+            if item_type == "p":
+                paragraphs.append(item["content"])
+            elif item_type in _KEY_POINT_TYPES:
                 key_points.append(item["content"])
-        return key_points
+        return "\n\n".join(paragraphs), key_points
     
     def _filter_relevant_images(self, images: List[Dict]) -> List[Dict]:
         """Filter and return relevant images."""
-        relevant_images = []
-        for image in images:
-            # Skip small icons, logos, etc.
-            if "icon" not in image["alt"].lower() and "logo" not in image["alt"].lower():
-                relevant_images.append(image)
+        # Skip small icons, logos, etc.
+        relevant_images = [image for image in images if not _DECORATIVE_ALT.search(image.get("alt", ""))]
         return relevant_images[:5]  # Limit to top 5 relevant images
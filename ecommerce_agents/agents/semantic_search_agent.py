@@ -6,14 +6,63 @@ This agent uses Exa AI to:
 2. Exclude business and competitor URLs from results
 3. Return top 15 results with source tracking
 """
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
+from functools import lru_cache
+from urllib.parse import urlsplit
 from phi.agent import Agent
 from ..admin.api import AdminAPI
 from ..tools.exa_tool import ExaSearchTool
 import os
 import asyncio
 
+def _host(url: str) -> str:
+    """Lowercased host of a URL or bare domain, without any leading 'www.'."""
+    url = url.strip()
+    # urlsplit only finds the host after '//', so bare domains need a prefix
+    if "//" not in url:
+        url = f"//{url}"
+    try:
+        host = urlsplit(url).hostname or ""
+    except ValueError:
+        return ""
+    return host.removeprefix("www.")
+
+@lru_cache(maxsize=256)
+def _exclusions(excluded: Tuple[str, ...]) -> Tuple[frozenset, frozenset]:
+    """
+    Split exclusions into domain hosts and bare names, computed once per
+    distinct exclusion list.
+    
+    Competitors are often entered as names such as "New Balance" rather than
+    domains. Only the hosts can be sent to Exa; names are matched locally,
+    with whitespace removed, against whole labels of result hosts, e.g.
+    "newbalance.com" or "shop.new-balance.co.uk".
+    """
+    hosts = set()
+    names = set()
+    for entry in excluded:
+        entry = entry.strip()
+        if "." in entry and not any(char.isspace() for char in entry):
+            if host := _host(entry):
+                hosts.add(host)
+        elif entry:
+            names.add("".join(entry.lower().split()))
+    return frozenset(hosts), frozenset(names)
+
+def _is_excluded(url: str, excluded_hosts: frozenset, excluded_names: frozenset = frozenset()) -> bool:
+    """Check whether a URL's host, or any domain it belongs to, is excluded."""
+    host = _host(url)
+    # Whole labels only, so a short name like "on" doesn't exclude amazon.com
+    if excluded_names and any(label.replace("-", "") in excluded_names for label in host.split(".")):
+        return True
+    while host:
+        if host in excluded_hosts:
+            return True
+        # Subdomains are excluded along with their domain, e.g. shop.brand.com
+        _, _, host = host.partition(".")
+    return False
+
 class SemanticSearchAgent(Agent):
     """
     An agent for performing semantic searches using Exa AI while
@@ -53,21 +102,23 @@ class SemanticSearchAgent(Agent):
         """
         # Get URLs to exclude
         excluded_urls = await self.get_excluded_urls(user_id)
+        excluded_hosts, excluded_names = _exclusions(tuple(excluded_urls))
         
-        # Prepare exclude sites query
-        exclude_query = " ".join(f"-site:{url}" for url in excluded_urls)
-        
-        # Combine with original query
-        full_query = f"{query} {exclude_query}"
-
-        # Use the Exa tool
-        results = self.search_tool._run(full_query, max_results=max_results * 2)
+        # Let Exa exclude the domains itself rather than padding the query with
+        # -site: operators and over-fetching to make up for filtered results.
+        # Exa only accepts domains, so competitor names are filtered below
+        results = self.search_tool._run(
+            query,
+            max_results=max_results,
+            exclude_domains=sorted(excluded_hosts)
+        )
         
         # Filter and enhance results
         filtered_results = []
         for r in results:
-            # Skip if URL contains any excluded domain
-            if any(ex_url in r['url'] for ex_url in excluded_urls):
+            # Filter competitor names, and guard against www. or subdomain
+            # variants slipping through
+            if _is_excluded(r['url'], excluded_hosts, excluded_names):
                 continue
             
             # Add additional metadata
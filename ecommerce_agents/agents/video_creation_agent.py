@@ -3,10 +3,10 @@ Video Creation Agent for generating video content from blog and image assets.
 """
 from typing import Dict, List, Optional
 from datetime import datetime
-import json
 import os
 from phi.agent import Agent
 from phi.llm.openai import OpenAIChat
+from ..utils import llm_json
 
 
 class VideoCreationAgent(Agent):
@@ -83,8 +83,12 @@ Example output format:
     def create_video(self, blog_content: Dict, images: Dict) -> Dict:
         """Create video content from blog post and images."""
         try:
+            # Serialize the sections and images once; every segment's prompts reuse them
+            sections_json = llm_json.dumps(blog_content['blog_post']['sections'], indent=True)
+            images_json = llm_json.dumps(images.get('generated_images', []), indent=True)
+            
             # Generate video structure
-            video_structure = self._create_video_structure(blog_content)
+            video_structure = self._create_video_structure(blog_content, sections_json)
             
             # Create segments
             segments = []
@@ -92,7 +96,7 @@ Example output format:
                 # Generate script
                 script = self._generate_script(
                     segment_type=segment["type"],
-                    blog_content=blog_content,
+                    sections_json=sections_json,
                     duration=segment["target_duration"]
                 )
                 
@@ -100,7 +104,7 @@ Example output format:
                 visuals = self._create_visuals(
                     segment_type=segment["type"],
                     script=script,
-                    images=images
+                    images_json=images_json
                 )
                 
                 # Generate audio
@@ -118,7 +122,7 @@ Example output format:
                 })
             
             # Generate thumbnails
-            thumbnails = self._generate_thumbnails(blog_content, images)
+            thumbnails = self._generate_thumbnails(blog_content, images_json)
             
             return {
                 "video_content": {
@@ -142,12 +146,12 @@ Example output format:
                 "blog_content": blog_content
             }
     
-    def _create_video_structure(self, blog_content: Dict) -> Dict:
-        """Create the video structure from blog content."""
+    def _create_video_structure(self, blog_content: Dict, sections_json: str) -> Dict:
+        """Create the video structure from blog content and its serialized sections."""
         prompt = f"""Create a video structure for this blog post:
 
 Title: {blog_content['blog_post']['title']}
-Sections: {json.dumps(blog_content['blog_post']['sections'], indent=2)}
+Sections: {sections_json}
 
 Return a JSON object with:
 1. title (video title)
@@ -156,14 +160,14 @@ Return a JSON object with:
 4. segments (list of segments with type and target duration)"""
 
         response = self.llm.complete(prompt)
-        return json.loads(response)
+        return llm_json.loads(response)
     
-    def _generate_script(self, segment_type: str, blog_content: Dict, duration: str) -> str:
-        """Generate a script for a video segment."""
+    def _generate_script(self, segment_type: str, sections_json: str, duration: str) -> str:
+        """Generate a script for a video segment from the serialized blog sections."""
         prompt = f"""Write a {duration} script for a {segment_type} segment.
 
 Blog content:
-{json.dumps(blog_content['blog_post']['sections'], indent=2)}
+{sections_json}
 
 The script should be:
 1. Engaging and conversational
@@ -175,13 +179,13 @@ Return only the script text."""
 
         return self.llm.complete(prompt)
     
-    def _create_visuals(self, segment_type: str, script: str, images: Dict) -> List[Dict]:
-        """Create visual sequence for a segment."""
+    def _create_visuals(self, segment_type: str, script: str, images_json: str) -> List[Dict]:
+        """Create visual sequence for a segment from the serialized available images."""
         prompt = f"""Create a visual sequence for this script:
 {script}
 
 Available images:
-{json.dumps(images.get('generated_images', []), indent=2)}
+{images_json}
 
 Return a JSON array of visual elements with:
 1. type (image, text, transition)
@@ -190,7 +194,7 @@ Return a JSON array of visual elements with:
 4. effects (if any)"""
 
         response = self.llm.complete(prompt)
-        return json.loads(response)
+        return llm_json.loads(response)
     
     def _generate_audio(self, script: str, segment_type: str) -> Dict:
         """Generate audio elements for a segment."""
@@ -205,13 +209,13 @@ Return a JSON array of visual elements with:
         # TODO: Implement music selection
         return "default_background_music.mp3"
     
-    def _generate_thumbnails(self, blog_content: Dict, images: Dict) -> List[Dict]:
-        """Generate video thumbnails."""
+    def _generate_thumbnails(self, blog_content: Dict, images_json: str) -> List[Dict]:
+        """Generate video thumbnails from the serialized available images."""
         prompt = f"""Create thumbnail options for this video:
 
 Title: {blog_content['blog_post']['title']}
 Available images:
-{json.dumps(images.get('generated_images', []), indent=2)}
+{images_json}
 
 Return a JSON array of thumbnail options with:
 1. url (image URL)
@@ -219,4 +223,4 @@ Return a JSON array of thumbnail options with:
 3. text_overlay (if any)"""
 
         response = self.llm.complete(prompt)
-        return json.loads(response)
+        return llm_json.loads(response)
@@ -25,7 +25,7 @@ def main():
         # Add a clear chat button to the sidebar
         if st.sidebar.button("Clear Chat History"):
             chat.clear_chat()
-            st.experimental_rerun()
+            st.rerun()
             
     else:  # Admin Panel
         admin.display_panel()
@@ -1,12 +1,13 @@
 import asyncio
 import sys
 from dotenv import load_dotenv
-import json
 from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
+from rich.live import Live
 from rich import print as rprint
 from ecommerce_agents.agents.query_agent import UserQueryAgent
+from ecommerce_agents.utils import llm_json
 
 # Load environment variables from .env file
 load_dotenv()
@@ -39,9 +40,10 @@ async def main():
                 console.print("[yellow]Goodbye![/yellow]")
                 break
                 
-            # Analyze query terms
+            # Analyze and enrich the query in a single round-trip
             console.print("\n[bold]Analyzing query...[/bold]")
-            terms = await agent.analyze_query_terms(query)
+            result = await agent.full_pipeline(query)
+            terms = result["components"]
             
             if not terms:
                 console.print("[red]Could not analyze query. Please try again.[/red]")
@@ -54,7 +56,7 @@ async def main():
             
             for key, value in terms.items():
                 if isinstance(value, dict):
-                    value_str = json.dumps(value, indent=2)
+                    value_str = llm_json.dumps(value, indent=True)
                 else:
                     value_str = str(value)
                 component_table.add_row(key, value_str)
@@ -63,7 +65,8 @@ async def main():
             
             # Enrich query
             console.print("\n[bold]Enriching query...[/bold]")
-            enriched = await agent.enrich_query(terms)
+            # The pipeline skips enrichment while components are missing
+            enriched = result["enriched"] or await agent.enrich_query_data(terms)
             
             if not enriched:
                 console.print("[red]Could not enrich query. Please try again.[/red]")
@@ -78,7 +81,7 @@ async def main():
                 if isinstance(value, list):
                     value_str = "\n".join(value)
                 elif isinstance(value, dict):
-                    value_str = json.dumps(value, indent=2)
+                    value_str = llm_json.dumps(value, indent=True)
                 else:
                     value_str = str(value)
                 enriched_table.add_row(key, value_str)
@@ -88,29 +91,26 @@ async def main():
             # Generate search queries
             console.print("\n[bold]Generating search queries...[/bold]")
             try:
-                queries = await agent.generate_search_queries(terms, enriched)
-                
-                # Display keyword queries
+                # Display keyword queries, which are built locally
                 keyword_table = Table(title="Keyword Queries")
                 keyword_table.add_column("Query", style="cyan")
                 keyword_table.add_column("Metadata", style="green")
                 
-                for query in queries["keyword_queries"]:
+                for query in agent.build_keyword_queries(enriched):
                     keyword_table.add_row(
                         query["query"],
-                        json.dumps(query["metadata"], indent=2)
+                        llm_json.dumps(query["metadata"], indent=True)
                     )
                 
                 console.print(keyword_table)
                 
-                # Display semantic queries
+                # Display semantic queries as the LLM streams them in
                 semantic_table = Table(title="Semantic Queries")
                 semantic_table.add_column("Query", style="cyan")
                 
-                for query in queries["semantic_queries"]:
-                    semantic_table.add_row(query)
-                
-                console.print(semantic_table)
+                with Live(semantic_table, console=console, refresh_per_second=10):
+                    async for query in agent.stream_search_queries(enriched, include_keywords=False):
+                        semantic_table.add_row(query)
             except Exception as e:
                 console.print(f"[red]Error processing search queries: {str(e)}[/red]")
                 continue
@@ -121,6 +121,8 @@ async def main():
         
         console.print("\n[bold]Ready for next query![/bold]")
 
+    await agent.close()
+
 def run():
     """Run the interactive query agent."""
     try:
@@ -10,11 +10,12 @@ import asyncio
 import os
 import sys
 import json
+import hashlib
 from dotenv import load_dotenv
 from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
-from typing import Dict
+from typing import Dict, Optional
 
 # Load environment variables from .env file
 load_dotenv()
@@ -26,6 +27,7 @@ if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
 from agents.query_agent import UserQueryAgent
+from utils.cache import PersistentCache
 from phi.agent import Agent, RunResponse  # Import for Agent and RunResponse
 
 # Initialize Rich console
@@ -136,13 +138,27 @@ async def print_result(result: Dict):
     
     console.print(table)
 
-async def process_query_with_details(agent: UserQueryAgent, query: str):
-    """Process a query and show all intermediate steps."""
+async def process_query_with_details(
+    agent: UserQueryAgent,
+    query: str,
+    plan_cache: Optional[PersistentCache] = None
+):
+    """Process a query and show all intermediate steps.
+
+    When a plan cache is given, query plans are looked up in it by the SHA256 of
+    the normalized query and stored there after a full run.
+    """
     try:
         console.print("\n[cyan]Processing query:[/cyan]", query)
         
+        # Repeat queries replay the stored plan without any LLM or embedding calls
+        key = hashlib.sha256(query.strip().lower().encode()).hexdigest()
+        plan = plan_cache.get(key) if plan_cache is not None else None
+        if plan_cache is not None:
+            console.print(f"[dim]Plan cache: {'HIT' if plan is not None else 'MISS'}[/dim]")
+        
         # Analyze the query and get components
-        components = await analyze_user_query(agent, query)
+        components = plan["analysis"] if plan is not None else await analyze_user_query(agent, query)
         console.print("\n[yellow]Debug - Components Structure:[/yellow]")
         console.print(json.dumps(components, indent=2))
 
@@ -152,7 +168,7 @@ async def process_query_with_details(agent: UserQueryAgent, query: str):
 
         # Enrich the query data
         console.print("\n[cyan]Enriching query with relevant terms...[/cyan]")
-        enriched = await agent.enrich_query_data(components)
+        enriched = plan["enriched"] if plan is not None else await agent.enrich_query_data(components)
         
         if enriched:
             # Debug: Print the raw enriched data structure
@@ -195,7 +211,16 @@ async def process_query_with_details(agent: UserQueryAgent, query: str):
 
         # Generate search queries
         console.print("\n[cyan]Generating search queries...[/cyan]")
-        search_queries = await agent.generate_search_queries(enriched)
+        if plan is not None:
+            search_queries = plan["search_queries"]
+        else:
+            search_queries = await agent.generate_search_queries(enriched)
+            if plan_cache is not None and enriched and search_queries["semantic_queries"]:
+                plan_cache.set(key, {
+                    "analysis": components,
+                    "enriched": enriched,
+                    "search_queries": search_queries
+                })
         if search_queries:
             console.print("\n[bold cyan]Generated Search Queries:[/bold cyan]")
             for query_type, queries in search_queries.items():
@@ -208,27 +233,40 @@ async def process_query_with_details(agent: UserQueryAgent, query: str):
         import traceback
         console.print(traceback.format_exc())
 
-async def test_interactive():
-    """Interactive testing function for the UserQueryAgent."""
+async def test_interactive(plan_cache_db: Optional[str] = None):
+    """Interactive testing function for the UserQueryAgent.
+
+    Args:
+        plan_cache_db: SQLite file for the query plan cache, defaulting to the
+            PLAN_CACHE_DB environment variable or tmp/plan_cache.db
+    """
     agent = UserQueryAgent()
+    # Query plans are kept for a day
+    plan_cache = PersistentCache(
+        plan_cache_db or os.getenv("PLAN_CACHE_DB", "tmp/plan_cache.db"),
+        ttl=24 * 60 * 60
+    )
     
     console.print(Panel.fit(
         "[bold blue]Interactive Query Agent Test[/bold blue]\n"
         "Enter your queries for analysis. Type 'exit' to quit."
     ))
     
-    while True:
-        try:
-            query = get_input("\n[bold green]Enter your query:[/bold green]")
-            if not query or query.lower() == 'exit':
-                break
-
-            # Process the query
-            await process_query_with_details(agent, query)
-                
-        except Exception as e:
-            console.print(f"[red]Error processing query: {str(e)}[/red]")
-            continue
+    try:
+        while True:
+            try:
+                query = get_input("\n[bold green]Enter your query:[/bold green]")
+                if not query or query.lower() == 'exit':
+                    break
+
+                # Process the query
+                await process_query_with_details(agent, query, plan_cache)
+                    
+            except Exception as e:
+                console.print(f"[red]Error processing query: {str(e)}[/red]")
+                continue
+    finally:
+        plan_cache.close()
 
 if __name__ == "__main__":
     try:
@@ -3,8 +3,13 @@ Test script for admin functionality including database operations.
 """
 import os
 import json
+import time
+import asyncio
+import sqlite3
+import pytest
 from pathlib import Path
 from ecommerce_agents.admin import AdminAPI, UpdateSettingsRequest
+from ecommerce_agents.admin.settings import AdminSettings, AdminStorage
 
 def test_admin_crud():
     """Test Create, Read, Update, Delete operations for admin settings."""
@@ -72,6 +77,86 @@ def test_admin_crud():
     
     print("\n✓ All admin tests passed successfully!")
 
+def test_settings_cache_expires(tmp_path):
+    """Test that writes made through another storage instance show up once the cache expires."""
+    async def run():
+        db_file = str(tmp_path / "admin.db")
+        writer = AdminStorage(db_file)
+        reader = AdminStorage(db_file, cache_ttl=0.05)
+        try:
+            await writer.save_settings(AdminSettings(user_id="u", competitors=["CompA"]))
+            assert (await reader.get_settings("u")).competitors == ["CompA"]
+            await writer.save_settings(AdminSettings(user_id="u", competitors=["CompB"]))
+            assert (await reader.get_settings("u")).competitors == ["CompA"]
+            time.sleep(0.1)
+            assert (await reader.get_settings("u")).competitors == ["CompB"]
+        finally:
+            writer.close()
+            reader.close()
+    asyncio.run(run())
+
+def test_cancelled_save_keeps_writer_alive(tmp_path):
+    """Test that cancelling a pending save doesn't stop later saves from committing."""
+    async def run():
+        storage = AdminStorage(str(tmp_path / "admin.db"))
+        try:
+            for _ in range(10):
+                task = asyncio.create_task(storage.save_settings(AdminSettings(user_id="u", competitors=["CompA"])))
+                await asyncio.sleep(0)
+                task.cancel()
+            await asyncio.wait_for(storage.save_settings(AdminSettings(user_id="u", competitors=["CompB"])), 5)
+            assert storage._writer.is_alive()
+            assert (await storage.get_settings("u")).competitors == ["CompB"]
+        finally:
+            storage.close()
+    asyncio.run(run())
+
+def test_get_settings_returns_a_copy(tmp_path):
+    """Test that changing returned settings doesn't change what other readers see."""
+    async def run():
+        storage = AdminStorage(str(tmp_path / "admin.db"))
+        try:
+            await storage.save_settings(AdminSettings(user_id="u", competitors=["CompA"]))
+            settings = await storage.get_settings("u")
+            settings.competitors.append("CompB")
+            assert (await storage.get_settings("u")).competitors == ["CompA"]
+        finally:
+            storage.close()
+    asyncio.run(run())
+
+def test_migrate_legacy_table(tmp_path):
+    """Test that the single-blob schema is migrated, and left intact if a row is bad."""
+    db_file = str(tmp_path / "admin.db")
+
+    def create_legacy(rows):
+        conn = sqlite3.connect(db_file)
+        conn.execute("DROP TABLE IF EXISTS admin_settings")
+        conn.execute("CREATE TABLE admin_settings (user_id TEXT PRIMARY KEY, settings TEXT)")
+        conn.executemany("INSERT INTO admin_settings VALUES (?, ?)", rows)
+        conn.commit()
+        conn.close()
+
+    def tables():
+        conn = sqlite3.connect(db_file)
+        names = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        conn.close()
+        return names
+
+    create_legacy([("u1", json.dumps({"competitors": ["CompA"]})), ("u2", "not json")])
+    with pytest.raises(Exception):
+        AdminStorage(db_file)
+    assert tables() == {"admin_settings"}
+
+    create_legacy([("u1", json.dumps({"competitors": ["CompA"], "main_urls": ["https://a.com"]}))])
+    storage = AdminStorage(db_file)
+    try:
+        settings = asyncio.run(storage.get_settings("u1"))
+        assert settings.competitors == ["CompA"]
+        assert settings.main_urls == ["https://a.com"]
+        assert tables() == {"admin_settings"}
+    finally:
+        storage.close()
+
 def display_current_settings(api):
     """Helper function to display current settings."""
     settings = api.get_settings()
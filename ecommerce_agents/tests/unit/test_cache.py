@@ -0,0 +1,71 @@
+"""
+Unit tests for the in-process cache utilities.
+"""
+import time
+from ecommerce_agents.utils.cache import PersistentCache, SemanticCache, TTLCache
+
+def test_get_and_set():
+    """Test basic get/set behaviour and defaults for missing keys."""
+    cache = TTLCache(maxsize=2)
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    assert cache.get("missing") is None
+    assert cache.get("missing", "default") == "default"
+    assert "a" in cache
+
+def test_lru_eviction():
+    """Test that the least recently used entry is evicted when full."""
+    cache = TTLCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # "b" is now least recently used
+    cache.set("c", 3)
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
+    assert len(cache) == 2
+
+def test_ttl_expiry():
+    """Test that entries expire once their TTL has passed."""
+    cache = TTLCache(maxsize=10, ttl=0.01)
+    cache.set("a", 1)
+    time.sleep(0.02)
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+def test_semantic_cache_threshold():
+    """Test that only vectors within the distance threshold hit."""
+    cache = SemanticCache(maxsize=10, threshold=0.1)
+    cache.set("analysis", [1.0, 0.0], "first")
+    assert cache.get("analysis", [0.99, 0.05]) == "first"
+    assert cache.get("analysis", [0.0, 1.0]) is None
+    assert cache.get("other", [1.0, 0.0]) is None
+
+def test_semantic_cache_eviction():
+    """Test that the oldest entry is evicted when a namespace is full."""
+    cache = SemanticCache(maxsize=1)
+    cache.set("analysis", [1.0, 0.0], "first")
+    cache.set("analysis", [0.0, 1.0], "second")
+    assert cache.get("analysis", [1.0, 0.0]) is None
+    assert cache.get("analysis", [0.0, 1.0]) == "second"
+    assert len(cache) == 1
+
+def test_persistent_cache_survives_reopen(tmp_path):
+    """Test that entries persist across cache instances on the same file."""
+    db_file = str(tmp_path / "cache.db")
+    cache = PersistentCache(db_file)
+    cache.set("a", {"title": "T"}, etag='"v1"')
+    cache.close()
+    reopened = PersistentCache(db_file)
+    assert reopened.get("a") == {"title": "T"}
+    assert reopened.get_entry("a") == ({"title": "T"}, '"v1"', True)
+    assert reopened.get("missing") is None
+    assert len(reopened) == 1
+
+def test_persistent_cache_expiry(tmp_path):
+    """Test that expired entries are stale but still available for revalidation."""
+    cache = PersistentCache(str(tmp_path / "cache.db"), ttl=0.01)
+    cache.set("a", [1, 2], etag='"v1"')
+    time.sleep(0.02)
+    assert cache.get("a") is None
+    assert cache.get_entry("a") == ([1, 2], '"v1"', False)
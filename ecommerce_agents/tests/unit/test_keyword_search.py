@@ -359,4 +359,26 @@ async def test_query_combinations():
         
         # Verify metadata
         assert query["metadata"]["time_limit"] == "6 months"
-        assert len(query["metadata"]["locations"]) == 3  # Japan, South Korea, China
\ No newline at end of file
+        assert len(query["metadata"]["locations"]) == 3  # Japan, South Korea, China
+
+
+def test_relevance_counts_overlapping_terms():
+    """Test that each query term scores on its own, even when terms overlap."""
+    from ecommerce_agents.agents.keyword_search_agent import SearchQuery
+    agent = KeywordSearchAgent()
+    for query in ["shoe shoes", "run running", "running shoes"]:
+        search_terms = SearchQuery(original_query=query, parsed_query=query).search_terms
+        assert agent._calculate_relevance("Running Shoes", "", search_terms) == 1.0
+    search_terms = SearchQuery(original_query="trail shoes", parsed_query="trail shoes").search_terms
+    assert agent._calculate_relevance("Running Shoes", "Trail guide", search_terms) == 0.8
+
+
+def test_normalize_url_matches_urlparse():
+    """Test that the regex fast path normalizes URLs the same way as urlparse."""
+    from urllib.parse import urlparse
+    from ecommerce_agents.agents.keyword_search_agent import _normalize_url
+    for url in ["HTTPS://EX.COM/A", "https://Ex.com/a/b?q=1#top", "http://ex.com"]:
+        parsed = urlparse(url)
+        expected = f"{parsed.scheme}://{parsed.netloc.lower()}{parsed.path}"
+        assert _normalize_url(url) == (parsed.netloc.lower(), expected)
+    assert _normalize_url("HTTPS://EX.COM/A")[1] == "https://ex.com/A"
@@ -0,0 +1,22 @@
+"""
+Unit tests for the LLM JSON helpers.
+"""
+import pytest
+from ecommerce_agents.utils import llm_json
+
+def test_dumps():
+    """Test compact and indented serialization."""
+    assert llm_json.dumps({"a": [1, 2]}) == '{"a":[1,2]}'
+    assert llm_json.dumps({"a": 1}, indent=True) == '{\n  "a": 1\n}'
+    assert llm_json.dumps(["café"]) == '["café"]'
+
+def test_loads_embedded_json():
+    """Test that JSON wrapped in a fence or preamble is still found."""
+    assert llm_json.loads('{"a": 1}') == {"a": 1}
+    assert llm_json.loads('Here you go:\n```json\n[{"a": 1}]\n```') == [{"a": 1}]
+    assert llm_json.loads('Note {not json} then {"b": 2}') == {"b": 2}
+
+def test_loads_without_json():
+    """Test that text without any JSON raises ValueError."""
+    with pytest.raises(ValueError):
+        llm_json.loads("no json here")
@@ -42,6 +42,49 @@ def mock_openai():
         mock.return_value = mock_instance
         yield mock_instance
 
+def test_response_format_is_strict_compatible():
+    """Test that no schema sent to the API has a $ref with sibling keywords."""
+    from agents.query_agent import (
+        _response_format, CategoryResult, QueryAnalysis, QueryEnrichment,
+        QueryPipeline, SemanticQueries, ValidationResult
+    )
+
+    def refs_with_siblings(node):
+        if isinstance(node, dict):
+            if "$ref" in node and len(node) > 1:
+                yield node
+            for value in node.values():
+                yield from refs_with_siblings(value)
+        elif isinstance(node, list):
+            for value in node:
+                yield from refs_with_siblings(value)
+
+    for schema in (CategoryResult, QueryAnalysis, QueryEnrichment, QueryPipeline, SemanticQueries, ValidationResult):
+        json_schema = _response_format(schema)["json_schema"]
+        assert json_schema["strict"] is True
+        assert not list(refs_with_siblings(json_schema["schema"])), schema.__name__
+
+def test_category_index():
+    """Test that products and their singulars resolve to the same category."""
+    index = UserQueryAgent.CATEGORY_INDEX
+    # "accessories" is both a category and a sports product; the category wins
+    assert index["accessories"] == "accessories"
+    assert index["accessory"] == "accessories"
+    assert index["watch"] == "accessories"
+    assert index["scarf"] == "accessories"
+    assert index["shoe"] == "footwear"
+    assert "scarve" not in index
+    assert "pant" not in index
+
+def test_analysis_cues():
+    """Test that queries asking for different objectives or scopes get different cues."""
+    def cues(query):
+        return [label for label, pattern in UserQueryAgent.ANALYSIS_CUE_PATTERNS if pattern.search(query)]
+    assert cues("running shoes trends in europe") == ["trends"]
+    assert cues("trending running shoes in europe") == ["trends"]
+    assert cues("running shoes demand in europe") == ["demand"]
+    assert cues("eco-friendly sneaker price trends") == ["trends", "sustainability", "price"]
+
 @pytest.mark.asyncio
 async def test_temporal_metadata_processing(query_agent):
     """Test temporal metadata processing for different time contexts."""
@@ -25,6 +25,7 @@ from typing import Dict, List, Optional, Any
 from phi.tools.tool import Tool
 from duckduckgo_search import DDGS
 from duckduckgo_search.exceptions import RatelimitException
+import asyncio
 import logging
 import time
 
@@ -64,10 +65,7 @@ class DuckDuckGoSearchTool(Tool):
                 
                 results = []
                 for r in ddg_results:
-                    # Print raw result for debugging
-                    print("\nRaw DuckDuckGo result:")
-                    for key, value in r.items():
-                        print(f"{key}: {value}")
+                    logger.debug("Raw DuckDuckGo result: %s", r)
                     
                     # Map DuckDuckGo fields to our expected format
                     result = {
@@ -128,10 +126,7 @@ class DuckDuckGoSearchTool(Tool):
             logger.info(f"Raw DuckDuckGo results count: {len(ddg_results)}")
             
             for r in ddg_results:
-                # Print raw result for debugging
-                print("\nRaw DuckDuckGo result:")
-                for key, value in r.items():
-                    print(f"{key}: {value}")
+                logger.debug("Raw DuckDuckGo result: %s", r)
                 
                 # Map DuckDuckGo fields to our expected format
                 result = {
@@ -161,8 +156,10 @@ class DuckDuckGoSearchTool(Tool):
                     timelimit: Optional[str] = None
                     ) -> List[Dict]:
         """Run asynchronous search."""
-        # For now, we'll use the sync version since DuckDuckGo doesn't have an async API
-        return self._run(
+        # DuckDuckGo doesn't have an async API, so run the sync version in a worker
+        # thread to let concurrent searches overlap instead of blocking the event loop
+        return await asyncio.to_thread(
+            self._run,
             query=query,
             max_results=max_results,
             region=region,
@@ -22,13 +22,14 @@ class ExaSearchTool(Tool):
             raise ValueError("EXA_API_KEY environment variable not set")
         self.base_url = "https://api.exa.ai/search"
     
-    def _run(self, query: str, max_results: int = 10) -> List[Dict]:
+    def _run(self, query: str, max_results: int = 10, exclude_domains: Optional[List[str]] = None) -> List[Dict]:
         """
         Run Exa search and return structured results.
         
         Args:
             query: Search query string
             max_results: Maximum number of results to return (default: 10)
+            exclude_domains: Domains Exa should leave out of the results
             
         Returns:
             List of dictionaries containing search results with score, title, date, etc.
@@ -43,6 +44,8 @@ class ExaSearchTool(Tool):
                 "query": query,
                 "num_results": max_results
             }
+            if exclude_domains:
+                params["excludeDomains"] = exclude_domains
             
             response = requests.post(self.base_url, headers=headers, json=params)
             response.raise_for_status()
@@ -69,6 +72,6 @@ class ExaSearchTool(Tool):
             print(f"Error performing Exa search: {str(e)}")
             return []
     
-    async def _arun(self, query: str, max_results: int = 10) -> List[Dict]:
+    async def _arun(self, query: str, max_results: int = 10, exclude_domains: Optional[List[str]] = None) -> List[Dict]:
         """Async version of the run method."""
-        return self._run(query, max_results)
+        return self._run(query, max_results, exclude_domains)
@@ -1,10 +1,13 @@
 from typing import Dict, List, Optional, Any
 from phi.tools.tool import Tool
 import requests
+import httpx
+import asyncio
 from bs4 import BeautifulSoup
-import json
+import orjson
 import os
 import logging
+from ecommerce_agents.utils.cache import PersistentCache
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +26,48 @@ class FirecrawlTool(Tool):
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
         }
     
+    def _parse_page(self, url: str, content: bytes) -> Dict:
+        """Extract the title, text content and images of a fetched page."""
+        # Parse with BeautifulSoup
+        soup = BeautifulSoup(content, 'html.parser')
+        
+        # Extract text content
+        text_content = []
+        for p in soup.find_all(['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6']):
+            text = p.get_text(strip=True)
+            if text:  # Only add non-empty text
+                text_content.append({
+                    'type': p.name,
+                    'content': text
+                })
+        
+        # Extract images
+        images = []
+        for img in soup.find_all('img'):
+            src = img.get('src', '')
+            alt = img.get('alt', '')
+            if src:  # Only add images with valid src
+                images.append({
+                    'src': src if src.startswith('http') else f"{url.rstrip('/')}/{src.lstrip('/')}",
+                    'alt': alt
+                })
+        
+        # Structure the results
+        return {
+            'url': url,
+            'title': soup.title.string if soup.title else '',
+            'text_content': text_content,
+            'images': images,
+            'status': 'success'
+        }
+    
+    def _save_results(self, results: List[Dict], save_path: Optional[str]) -> None:
+        """Save results as JSON if a path is provided."""
+        if save_path:
+            os.makedirs(os.path.dirname(save_path), exist_ok=True)
+            with open(save_path, 'wb') as f:
+                f.write(orjson.dumps(results, option=orjson.OPT_INDENT_2))
+    
     def _run(self, urls: List[str], save_path: Optional[str] = None) -> List[Dict]:
         """
         Scrape content from provided URLs.
@@ -41,39 +86,7 @@ class FirecrawlTool(Tool):
                 # Fetch the webpage
                 response = requests.get(url, headers=self.headers, timeout=30)
                 response.raise_for_status()
-                
-                # Parse with BeautifulSoup
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                # Extract text content
-                text_content = []
-                for p in soup.find_all(['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6']):
-                    text = p.get_text(strip=True)
-                    if text:  # Only add non-empty text
-                        text_content.append({
-                            'type': p.name,
-                            'content': text
-                        })
-                
-                # Extract images
-                images = []
-                for img in soup.find_all('img'):
-                    src = img.get('src', '')
-                    alt = img.get('alt', '')
-                    if src:  # Only add images with valid src
-                        images.append({
-                            'src': src if src.startswith('http') else f"{url.rstrip('/')}/{src.lstrip('/')}",
-                            'alt': alt
-                        })
-                
-                # Structure the results
-                result = {
-                    'url': url,
-                    'title': soup.title.string if soup.title else '',
-                    'text_content': text_content,
-                    'images': images,
-                    'status': 'success'
-                }
+                result = self._parse_page(url, response.content)
                 
             except Exception as e:
                 result = {
@@ -84,14 +97,68 @@ class FirecrawlTool(Tool):
             
             results.append(result)
         
-        # Save results if path provided
-        if save_path:
-            os.makedirs(os.path.dirname(save_path), exist_ok=True)
-            with open(save_path, 'w', encoding='utf-8') as f:
-                json.dump(results, f, indent=2, ensure_ascii=False)
-        
+        self._save_results(results, save_path)
         return results
     
-    async def _arun(self, urls: List[str], save_path: Optional[str] = None) -> List[Dict]:
-        """Async version of the run method."""
-        return self._run(urls, save_path)
+    async def _scrape_one(
+        self,
+        client: httpx.AsyncClient,
+        semaphore: asyncio.Semaphore,
+        url: str,
+        cache: Optional[PersistentCache] = None
+    ) -> Dict:
+        """Fetch and parse a single URL under the shared semaphore, via the cache if given."""
+        # Cache reads and writes hit SQLite, so like parsing they run off the event loop
+        entry = await asyncio.to_thread(cache.get_entry, url) if cache is not None else None
+        if entry and entry[2]:
+            return entry[0]
+        
+        # Revalidate an expired page instead of downloading it again if unchanged
+        headers = {"If-None-Match": entry[1]} if entry and entry[1] else None
+        async with semaphore:
+            response = await client.get(url, headers=headers)
+        if entry and response.status_code == 304:
+            await asyncio.to_thread(cache.set, url, entry[0], entry[1])
+            return entry[0]
+        response.raise_for_status()
+        
+        # Parsing is CPU-bound, so keep it off the event loop
+        result = await asyncio.to_thread(self._parse_page, url, response.content)
+        if cache is not None:
+            await asyncio.to_thread(cache.set, url, result, response.headers.get("etag"))
+        return result
+    
+    async def _arun(
+        self,
+        urls: List[str],
+        save_path: Optional[str] = None,
+        max_concurrency: int = 5,
+        cache: Optional[PersistentCache] = None
+    ) -> List[Dict]:
+        """
+        Scrape content from provided URLs concurrently.
+        
+        Args:
+            urls: List of URLs to scrape
+            save_path: Optional path to save scraped content as JSON
+            max_concurrency: Maximum number of pages fetched at once
+            cache: Optional cache of scraped pages keyed by URL; fresh pages are
+                served from it, expired ones revalidated with their ETag
+            
+        Returns:
+            List of dictionaries containing scraped content, in the order of urls
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        async with httpx.AsyncClient(headers=self.headers, timeout=30, follow_redirects=True) as client:
+            scraped = await asyncio.gather(
+                *(self._scrape_one(client, semaphore, url, cache) for url in urls),
+                return_exceptions=True
+            )
+        
+        results = [
+            {'url': url, 'error': str(result), 'status': 'error'} if isinstance(result, Exception) else result
+            for url, result in zip(urls, scraped)
+        ]
+        
+        await asyncio.to_thread(self._save_results, results, save_path)
+        return results
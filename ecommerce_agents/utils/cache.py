@@ -0,0 +1,193 @@
+"""In-process caching utilities for the ecommerce agents."""
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+import os
+import sqlite3
+import threading
+import time
+import numpy as np
+import orjson
+
+_MISSING = object()
+
+class TTLCache:
+    """
+    Bounded LRU cache whose entries optionally expire after a fixed time-to-live.
+    
+    Args:
+        maxsize: Maximum number of entries kept before evicting the least recently used
+        ttl: Seconds an entry stays valid, or None to keep entries until evicted
+    """
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key, or default if missing or expired."""
+        entry = self._data.get(key, _MISSING)
+        if entry is _MISSING:
+            return default
+        expires_at, value = entry
+        if expires_at and expires_at < time.monotonic():
+            del self._data[key]
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store value under key, evicting the least recently used entry if full."""
+        expires_at = time.monotonic() + self.ttl if self.ttl else 0.0
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove key and return its value, or default if missing."""
+        entry = self._data.pop(key, _MISSING)
+        return default if entry is _MISSING else entry[1]
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._data.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SemanticCache:
+    """
+    Bounded nearest-neighbour cache keyed by embedding vectors.
+    
+    A lookup hits when a stored vector in the same namespace lies within
+    `threshold` cosine distance of the query vector.
+    
+    Args:
+        maxsize: Maximum number of entries kept per namespace before evicting the oldest
+        threshold: Largest cosine distance still treated as a hit
+        ttl: Seconds an entry stays valid, or None to keep entries until evicted
+    """
+    def __init__(self, maxsize: int = 1024, threshold: float = 0.1, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.threshold = threshold
+        self.ttl = ttl
+        self._vectors: Dict[str, np.ndarray] = {}
+        self._entries: Dict[str, List[tuple[float, Any]]] = {}
+
+    @staticmethod
+    def _unit(vector: Sequence[float]) -> np.ndarray:
+        array = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(array)
+        return array / norm if norm else array
+
+    def get(self, namespace: str, vector: Sequence[float], default: Any = None) -> Any:
+        """Return the value of the closest live entry within threshold, or default."""
+        matrix = self._vectors.get(namespace)
+        if matrix is None or not len(matrix):
+            return default
+        similarities = matrix @ self._unit(vector)
+        best = int(np.argmax(similarities))
+        if 1.0 - similarities[best] > self.threshold:
+            return default
+        expires_at, value = self._entries[namespace][best]
+        if expires_at and expires_at < time.monotonic():
+            self._evict(namespace, best)
+            return default
+        return value
+
+    def set(self, namespace: str, vector: Sequence[float], value: Any) -> None:
+        """Store value under vector, evicting the oldest entry if the namespace is full."""
+        expires_at = time.monotonic() + self.ttl if self.ttl else 0.0
+        row = self._unit(vector)[np.newaxis, :]
+        matrix = self._vectors.get(namespace)
+        self._vectors[namespace] = row if matrix is None else np.vstack((matrix, row))
+        self._entries.setdefault(namespace, []).append((expires_at, value))
+        while len(self._entries[namespace]) > self.maxsize:
+            self._evict(namespace, 0)
+
+    def _evict(self, namespace: str, index: int) -> None:
+        self._vectors[namespace] = np.delete(self._vectors[namespace], index, axis=0)
+        del self._entries[namespace][index]
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._vectors.clear()
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._entries.values())
+
+
+class PersistentCache:
+    """
+    SQLite-backed cache of JSON-serializable values that survives restarts.
+    
+    Each entry may carry a validator such as an HTTP ETag, so an expired entry
+    can still be revalidated with the origin instead of refetched in full.
+    
+    Args:
+        db_file: Path of the SQLite database file
+        ttl: Seconds an entry stays fresh, or None to keep entries fresh forever
+    """
+    def __init__(self, db_file: str, ttl: Optional[float] = None):
+        directory = os.path.dirname(db_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_file, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS cache (
+                key TEXT PRIMARY KEY,
+                stored_at REAL NOT NULL,
+                etag TEXT,
+                value BLOB NOT NULL
+            )
+        """)
+
+    def get_entry(self, key: str) -> Optional[Tuple[Any, Optional[str], bool]]:
+        """Return (value, etag, is_fresh) for key, including expired entries, or None if missing."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT stored_at, etag, value FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        stored_at, etag, value = row
+        # Wall-clock time, since entries outlive the process
+        is_fresh = not self.ttl or stored_at + self.ttl >= time.time()
+        return orjson.loads(value), etag, is_fresh
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the fresh cached value for key, or default if missing or expired."""
+        entry = self.get_entry(key)
+        if entry is None or not entry[2]:
+            return default
+        return entry[0]
+
+    def set(self, key: str, value: Any, etag: Optional[str] = None) -> None:
+        """Store value under key, marking it fresh as of now."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, stored_at, etag, value) VALUES (?, ?, ?, ?)",
+                (key, time.time(), etag, orjson.dumps(value))
+            )
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._conn.execute("DELETE FROM cache")
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
@@ -0,0 +1,38 @@
+"""Fast JSON helpers for building LLM prompts and parsing LLM responses."""
+from typing import Any, Union
+import json
+import re
+import orjson
+
+# Where a JSON object or array embedded in free text may start
+_JSON_START = re.compile(r"[{\[]")
+_DECODER = json.JSONDecoder()
+
+def dumps(obj: Any, indent: bool = False) -> str:
+    """Serialize obj to a JSON string, e.g. for embedding in a prompt."""
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None).decode()
+
+def loads(text: Union[str, bytes]) -> Any:
+    """
+    Parse the JSON in an LLM response.
+
+    The whole text is tried first. Failing that, the first JSON object or array
+    embedded in it is returned, e.g. one wrapped in a ```json fence or preceded
+    by a sentence of preamble.
+
+    Raises:
+        ValueError: If the text contains no valid JSON
+    """
+    try:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError as e:
+        error = e
+    if isinstance(text, bytes):
+        text = text.decode("utf-8", errors="replace")
+    for match in _JSON_START.finditer(text):
+        try:
+            value, _ = _DECODER.raw_decode(text, match.start())
+        except json.JSONDecodeError:
+            continue
+        return value
+    raise ValueError(f"No JSON found in LLM response: {error}")